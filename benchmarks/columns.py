@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""Compares Place objects with a ColumnStore snapshot of them.
+
+Usage: ./benchmarks/columns.py [objects]
+
+Reports the memory held by the Place instances and by their
+ColumnStore table, and the time of an average price scan over each.
+"""
+import os
+import sys
+import time
+import tracemalloc
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.column_store import ColumnStore  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def records(count):
+    """Yield to_dict() style dictionaries of count Places."""
+    cities = [str(uuid4()) for _ in range(100)]
+    now = "2017-09-28T21:05:54.119427"
+    for i in range(count):
+        yield {"id": str(uuid4()), "created_at": now, "updated_at": now,
+               "city_id": cities[i % 100], "name": "Place", "max_guest": 4,
+               "price_by_night": i % 300, "latitude": 37.7,
+               "longitude": -122.4, "__class__": "Place"}
+
+
+def measure(build):
+    """Return what build() returns and the bytes it allocated."""
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def timed(scan):
+    """Return the number of seconds scan() takes."""
+    start = time.perf_counter()
+    scan()
+    return time.perf_counter() - start
+
+
+def build_store(count):
+    """Return a ColumnStore of count Places."""
+    store = ColumnStore()
+    for odict in records(count):
+        store.add(odict)
+    return store
+
+
+def main(count=200000):
+    """Print memory and scan time for count Places."""
+    objs, objs_size = measure(
+        lambda: [Place.from_dict(o) for o in records(count)])
+    store, store_size = measure(lambda: build_store(count))
+    table = store.table(Place)
+    print("{} places".format(count))
+    print("{:<10}{:>10.1f} MB{:>10.3f} s".format(
+        "objects", objs_size / 1e6,
+        timed(lambda: sum(o.price_by_night for o in objs) / len(objs))))
+    print("{:<10}{:>10.1f} MB{:>10.3f} s".format(
+        "columns", store_size / 1e6,
+        timed(lambda: table.mean("price_by_night"))))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
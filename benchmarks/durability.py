@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""Measures the latency of FileStorage.save() at each durability level.
+
+Usage: ./benchmarks/durability.py [objects] [saves]
+
+Each save follows a single attribute update, both with full rewrites
+of file.json and in journal mode.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import models  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def bench(level, journal, places, saves):
+    """Return the mean latency in milliseconds of one update and save."""
+    FileStorage._FileStorage__durability = level
+    FileStorage._FileStorage__journal = journal
+    models.storage.save()
+    start = time.perf_counter()
+    for i in range(saves):
+        places[i % len(places)].max_guest = i
+        models.storage.save()
+    return (time.perf_counter() - start) * 1000 / saves
+
+
+def main(count=10000, saves=50):
+    """Print a table of save latencies for count Places."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        FileStorage._FileStorage__objects = {}
+        places = [Place() for _ in range(count)]
+        print("{} places, {} saves per run".format(count, saves))
+        print("{:<8}{:>14}{:>14}".format("level", "full (ms)",
+                                         "journal (ms)"))
+        for level in ("none", "flush", "fsync"):
+            full = bench(level, False, places, saves)
+            journal = bench(level, True, places, saves)
+            print("{:<8}{:>14.3f}{:>14.3f}".format(level, full, journal))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Compares GridIndex queries with a brute-force scan of every point.
+
+Usage: ./benchmarks/geo.py [places] [queries]
+
+Indexes random Place locations, then times "within 25 km" and
+"10 nearest" queries against scanning every location.
+"""
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.grid_index import GridIndex, distance  # noqa: E402
+
+
+def timed(queries, search):
+    """Return the mean number of seconds search takes per query."""
+    start = time.perf_counter()
+    for lat, lon in queries:
+        search(lat, lon)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main(count=1000000, nqueries=20):
+    """Print per-query times for count places."""
+    rand = random.Random(0)
+    points = {str(i): (rand.uniform(-60, 70), rand.uniform(-180, 180))
+              for i in range(count)}
+    start = time.perf_counter()
+    grid = GridIndex()
+    for id, (lat, lon) in points.items():
+        grid.update(id, lat, lon)
+    print("{} places, index built in {:.1f} s".format(
+        count, time.perf_counter() - start))
+    queries = [(rand.uniform(-60, 70), rand.uniform(-180, 180))
+               for _ in range(nqueries)]
+
+    def scan_within(lat, lon):
+        return sorted((d, id) for id, p in points.items()
+                      for d in (distance(lat, lon, *p),) if d <= 25)
+
+    def scan_nearest(lat, lon):
+        return heapq.nsmallest(10, ((distance(lat, lon, *p), id)
+                                    for id, p in points.items()))
+
+    print("{:<14}{:>14}{:>14}".format("", "scan", "grid"))
+    for name, scan, search in (
+            ("within 25 km", scan_within,
+             lambda lat, lon: grid.within(lat, lon, 25)),
+            ("10 nearest", scan_nearest,
+             lambda lat, lon: grid.nearest(lat, lon, 10))):
+        print("{:<14}{:>12.6f} s{:>12.6f} s".format(
+            name, timed(queries[:2], scan), timed(queries, search)))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""Measures FileStorage.reload() time with each datetime parsing path.
+
+Usage: ./benchmarks/reload.py [objects]
+
+Reloads a file.json of Reviews with the original strptime() parsing,
+with the fromisoformat() fast path, and with lazy datetimes.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import models  # noqa: E402
+from models.base_model import BaseModel  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+
+
+def strptime(value):
+    """Parse value the way BaseModel did before the fast path."""
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+
+
+def write_store(count):
+    """Write a file.json holding count Reviews to the current directory."""
+    now = datetime.today().isoformat()
+    with open("file.json", "w") as f:
+        f.write("{")
+        for i in range(count):
+            oid = str(uuid4())
+            rec = {"id": oid, "created_at": now, "updated_at": now,
+                   "place_id": str(uuid4()), "user_id": str(uuid4()),
+                   "text": "Great place", "__class__": "Review"}
+            f.write("{}{}: {}".format(", " if i else "",
+                                      json.dumps("Review." + oid),
+                                      json.dumps(rec)))
+        f.write("}")
+
+
+def bench():
+    """Return the number of seconds one reload takes."""
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    models.storage.reload()
+    return time.perf_counter() - start
+
+
+def main(count=500000):
+    """Print reload times for count Reviews."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        write_store(count)
+        print("{} reviews".format(count))
+        with patch("models.base_model.parse_datetime", strptime):
+            print("{:<16}{:>8.2f} s".format("strptime", bench()))
+        print("{:<16}{:>8.2f} s".format("fromisoformat", bench()))
+        BaseModel._BaseModel__lazy_datetimes = True
+        print("{:<16}{:>8.2f} s".format("lazy", bench()))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
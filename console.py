@@ -4,13 +4,7 @@ import cmd
 import re
 from shlex import split
 from models import storage
-from models.base_model import BaseModel
-from models.user import User
-from models.state import State
-from models.city import City
-from models.place import Place
-from models.amenity import Amenity
-from models.review import Review
+from models.base_model import classes
 
 
 def parse(arg):
@@ -31,6 +25,45 @@ def parse(arg):
         return retl
 
 
+def parse_paging(argl, names=("limit", "offset")):
+    """Remove the paging options in names, each followed by its value,
+    from argl.
+
+    The options are limit, offset and page, which take a number, and
+    cursor, which takes a key.
+
+    Returns:
+        A (argl, options) tuple; options maps each name given to its
+        value.
+    Raises:
+        ValueError: If an option is not followed by a valid value.
+    """
+    rest, options = [], {}
+    i = 0
+    while i < len(argl):
+        if argl[i] in names:
+            if i + 1 == len(argl) or (argl[i] != "cursor" and
+                                      not argl[i + 1].isdigit()):
+                raise ValueError(argl[i])
+            options[argl[i]] = (argl[i + 1] if argl[i] == "cursor"
+                                else int(argl[i + 1]))
+            i += 2
+        else:
+            rest.append(argl[i])
+            i += 1
+    return rest, options
+
+
+def print_list(objs):
+    """Print the string representations of objs like print() prints a
+    list of them, writing each one as soon as it is read."""
+    sep = "["
+    for obj in objs:
+        print(sep + repr(obj.__str__()), end="")
+        sep = ", "
+    print("[]" if sep == "[" else "]")
+
+
 class HBNBCommand(cmd.Cmd):
     """Defines the HolbertonBnB command interpreter.
 
@@ -39,15 +72,10 @@ class HBNBCommand(cmd.Cmd):
     """
 
     prompt = "(hbnb) "
-    __classes = {
-        "BaseModel",
-        "User",
-        "State",
-        "City",
-        "Place",
-        "Amenity",
-        "Review"
-    }
+    __condition = re.compile(
+        r"""(\w+)\s*(<=|>=|!=|==|=|<|>)\s*("[^"]*"|'[^']*'|[^,\s]+)""")
+    __operators = {"<": "lt", "<=": "lte", ">": "gt", ">=": "gte",
+                   "!=": "ne", "==": "eq", "=": "eq"}
 
     def emptyline(self):
         """Do nothing upon receiving an empty line."""
@@ -60,7 +88,9 @@ class HBNBCommand(cmd.Cmd):
             "show": self.do_show,
             "destroy": self.do_destroy,
             "count": self.do_count,
-            "update": self.do_update
+            "search": self.do_search,
+            "update": self.do_update,
+            "where": self.do_where
         }
         match = re.search(r"\.", arg)
         if match is not None:
@@ -76,11 +106,13 @@ class HBNBCommand(cmd.Cmd):
 
     def do_quit(self, arg):
         """Quit command to exit the program."""
+        storage.close()
         return True
 
     def do_EOF(self, arg):
         """EOF signal to exit the program."""
         print("")
+        storage.close()
         return True
 
     def do_create(self, arg):
@@ -90,71 +122,172 @@ class HBNBCommand(cmd.Cmd):
         argl = parse(arg)
         if len(argl) == 0:
             print("** class name missing **")
-        elif argl[0] not in HBNBCommand.__classes:
+        elif argl[0] not in classes:
             print("** class doesn't exist **")
         else:
-            print(eval(argl[0])().id)
+            print(classes[argl[0]]().id)
             storage.save()
 
+    def do_compact(self, arg):
+        """Usage: compact
+        Rewrite the storage snapshot and start a fresh journal."""
+        storage.compact()
+
     def do_show(self, arg):
         """Usage: show <class> <id> or <class>.show(<id>)
         Display the string representation of a class instance of a given id.
         """
         argl = parse(arg)
-        objdict = storage.all()
         if len(argl) == 0:
             print("** class name missing **")
-        elif argl[0] not in HBNBCommand.__classes:
+        elif argl[0] not in classes:
             print("** class doesn't exist **")
         elif len(argl) == 1:
             print("** instance id missing **")
-        elif "{}.{}".format(argl[0], argl[1]) not in objdict:
+        elif storage.get(argl[0], argl[1]) is None:
             print("** no instance found **")
         else:
-            print(objdict["{}.{}".format(argl[0], argl[1])])
+            print(storage.get(argl[0], argl[1]))
 
     def do_destroy(self, arg):
         """Usage: destroy <class> <id> or <class>.destroy(<id>)
         Delete a class instance of a given id."""
         argl = parse(arg)
-        objdict = storage.all()
         if len(argl) == 0:
             print("** class name missing **")
-        elif argl[0] not in HBNBCommand.__classes:
+        elif argl[0] not in classes:
             print("** class doesn't exist **")
         elif len(argl) == 1:
             print("** instance id missing **")
-        elif "{}.{}".format(argl[0], argl[1]) not in objdict.keys():
+        elif storage.get(argl[0], argl[1]) is None:
             print("** no instance found **")
         else:
-            del objdict["{}.{}".format(argl[0], argl[1])]
+            storage.delete(storage.get(argl[0], argl[1]))
             storage.save()
 
     def do_all(self, arg):
         """Usage: all or all <class> or <class>.all()
         Display string representations of all instances of a given class.
-        If no class is specified, displays all instantiated objects."""
-        argl = parse(arg)
-        if len(argl) > 0 and argl[0] not in HBNBCommand.__classes:
+        If no class is specified, displays all instantiated objects.
+        Append limit <n> and/or offset <n> to display one page of them,
+        or page <n> and/or cursor <key> to display them one per line,
+        page by page, each page ending with the cursor of the next."""
+        try:
+            argl, options = parse_paging(parse(arg), ("limit", "offset",
+                                                      "page", "cursor"))
+        except ValueError as e:
+            print("** invalid {} **".format(e))
+            return False
+        if len(argl) > 0 and argl[0] not in classes:
             print("** class doesn't exist **")
+        elif "page" in options or "cursor" in options:
+            if ("limit" in options or "offset" in options or
+                    options.get("page") == 0):
+                print("** invalid page **")
+                return False
+            self.__print_page(argl[0] if len(argl) > 0 else None,
+                              options.get("page"), options.get("cursor"))
+        elif len(argl) > 0 and options:
+            print_list(storage.query(argl[0]).offset(
+                options.get("offset", 0)).limit(options.get("limit")))
+        elif options:
+            keys = storage.keys(offset=options.get("offset", 0),
+                                limit=options.get("limit"))
+            print_list(storage.get(*key.split(".", 1)) for key in keys)
         else:
-            objl = []
-            for obj in storage.all().values():
-                if len(argl) > 0 and argl[0] == obj.__class__.__name__:
-                    objl.append(obj.__str__())
-                elif len(argl) == 0:
-                    objl.append(obj.__str__())
-            print(objl)
+            print_list(storage.all(argl[0] if len(argl) > 0
+                                   else None).values())
+
+    def __print_page(self, cls, size, cursor):
+        """Print the instances of cls, or of every class if None, one per
+        line: at most size of them, starting after the key cursor.
+
+        If instances are left, the page ends with a "next cursor: <key>"
+        line giving the cursor of the next page. Only the instances
+        printed are read; finding the cursor still scans the keys before
+        it, so resuming takes time linear in its position.
+        """
+        try:
+            keys = storage.keys(cls, after=cursor,
+                                limit=None if size is None else size + 1)
+        except KeyError:
+            print("** no instance found **")
+            return
+        for key in keys[:size]:
+            print(storage.get(*key.split(".", 1)))
+        if size is not None and len(keys) > size:
+            print("next cursor: {}".format(keys[size - 1]))
+
+    def do_where(self, arg):
+        """Usage: where <class> <conditions> or <class>.where(<conditions>)
+        Display the instances of a class meeting every condition, such
+        as price_by_night<100, max_guest>=4, found through the storage
+        indexes. Append limit <n> and/or offset <n> to display one page."""
+        argl = arg.split(maxsplit=1)
+        if len(argl) == 0:
+            print("** class name missing **")
+            return False
+        if argl[0] not in classes:
+            print("** class doesn't exist **")
+            return False
+        cls = classes[argl[0]]
+        rest = argl[1] if len(argl) > 1 else ""
+        conditions = HBNBCommand.__condition.findall(rest)
+        try:
+            words, options = parse_paging(
+                HBNBCommand.__condition.sub("", rest).replace(",",
+                                                              " ").split())
+        except ValueError as e:
+            print("** invalid {} **".format(e))
+            return False
+        if len(words) > 0:
+            print("** invalid condition: {} **".format(words[0]))
+            return False
+        query = storage.query(cls).offset(options.get("offset", 0)).limit(
+            options.get("limit"))
+        for name, op, value in conditions:
+            op = HBNBCommand.__operators[op]
+            declared = cls._defaults.get(name)
+            if value[:1] in "\"'" and value[:1] == value[-1:] != "":
+                value = value[1:-1]
+            elif type(declared) in (int, float) or declared is None:
+                for valtype in (int, float):
+                    try:
+                        value = valtype(value)
+                        break
+                    except ValueError:
+                        pass
+                else:
+                    if declared is not None:
+                        print("** invalid condition **")
+                        return False
+            if type(declared) is list and op == "eq":
+                op = "contains"
+            query.where(**{"{}__{}".format(name, op): value})
+        print_list(query)
 
     def do_count(self, arg):
         """Usage: count <class> or <class>.count()
         Retrieve the number of instances of a given class."""
         argl = parse(arg)
-        count = 0
-        for obj in storage.all().values():
-            if argl[0] == obj.__class__.__name__:
-                count += 1
-        print(count)
+        if len(argl) == 0:
+            print("** class name missing **")
+        else:
+            print(storage.count(argl[0]))
+
+    def do_search(self, arg):
+        """Usage: search [<class>] <words> or <class>.search(<words>)
+        Display the instances whose text matches any of the words,
+        best match first."""
+        argl = parse(arg)
+        if len(argl) > 0 and argl[0] in classes:
+            cls, words = argl[0], argl[1:]
+        else:
+            cls, words = None, argl
+        if len(words) == 0:
+            print("** search words missing **")
+            return False
+        print_list(storage.search(" ".join(words), cls).values())
 
     def do_update(self, arg):
         """Usage: update <class> <id> <attribute_name> <attribute_value> or
@@ -163,18 +296,18 @@ class HBNBCommand(cmd.Cmd):
         Update a class instance of a given id by adding or updating
         a given attribute key/value pair or dictionary."""
         argl = parse(arg)
-        objdict = storage.all()
 
         if len(argl) == 0:
             print("** class name missing **")
             return False
-        if argl[0] not in HBNBCommand.__classes:
+        if argl[0] not in classes:
             print("** class doesn't exist **")
             return False
         if len(argl) == 1:
             print("** instance id missing **")
             return False
-        if "{}.{}".format(argl[0], argl[1]) not in objdict.keys():
+        obj = storage.get(argl[0], argl[1])
+        if obj is None:
             print("** no instance found **")
             return False
         if len(argl) == 2:
@@ -188,21 +321,19 @@ class HBNBCommand(cmd.Cmd):
                 return False
 
         if len(argl) == 4:
-            obj = objdict["{}.{}".format(argl[0], argl[1])]
-            if argl[2] in obj.__class__.__dict__.keys():
-                valtype = type(obj.__class__.__dict__[argl[2]])
-                obj.__dict__[argl[2]] = valtype(argl[3])
+            if argl[2] in obj._defaults:
+                valtype = type(obj._defaults[argl[2]])
+                setattr(obj, argl[2], valtype(argl[3]))
             else:
-                obj.__dict__[argl[2]] = argl[3]
+                setattr(obj, argl[2], argl[3])
         elif type(eval(argl[2])) == dict:
-            obj = objdict["{}.{}".format(argl[0], argl[1])]
             for k, v in eval(argl[2]).items():
-                if (k in obj.__class__.__dict__.keys() and
-                        type(obj.__class__.__dict__[k]) in {str, int, float}):
-                    valtype = type(obj.__class__.__dict__[k])
-                    obj.__dict__[k] = valtype(v)
+                if (k in obj._defaults and
+                        type(obj._defaults[k]) in {str, int, float}):
+                    valtype = type(obj._defaults[k])
+                    setattr(obj, k, valtype(v))
                 else:
-                    obj.__dict__[k] = v
+                    setattr(obj, k, v)
         storage.save()
 
 
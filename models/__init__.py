@@ -1,7 +1,25 @@
 #!/usr/bin/python3
 """__init__ magic method for models directory"""
+import atexit
+import os
 from models.engine.file_storage import FileStorage
+from models.engine.compactor import Compactor
+from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.amenity import Amenity
+from models.review import Review
 
 
-storage = FileStorage()
+if os.getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage()
+else:
+    storage = FileStorage()
 storage.reload()
+atexit.register(storage.close)
+
+if os.getenv("HBNB_COMPACT_INTERVAL"):
+    Compactor(storage, float(os.getenv("HBNB_COMPACT_INTERVAL"))).start()
@@ -1,12 +1,218 @@
 #!/usr/bin/python3
 """Defines the BaseModel class."""
 import models
+import os
+import sys
 from uuid import uuid4
 from datetime import datetime
 
+classes = {}
+"""dict: Every model class, by name, filled in as classes are defined."""
 
-class BaseModel:
-    """Represents the BaseModel of the HBnB project."""
+COMPACT = os.getenv("HBNB_COMPACT_MODELS") == "1"
+"""bool: Whether model instances keep their attributes in __slots__."""
+
+
+def parse_datetime(value):
+    """Return the datetime of a string written by datetime.isoformat().
+
+    datetime.fromisoformat() is tried first as it is much faster than
+    datetime.strptime(), which remains the reference format.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+
+
+def intern_keys(cls, attrs):
+    """Intern the class name and foreign key strings of attrs in place.
+
+    Foreign keys repeat the same ids across many objects: interning
+    keeps one copy of each and makes comparing them an identity check.
+    Lists of ids (e.g. Place.amenity_ids) are replaced by a new list of
+    interned ids.
+
+    Args:
+        cls (type): The model class attrs belongs to.
+        attrs (dict): Attributes, as made by to_dict().
+    """
+    if "__class__" in attrs:
+        attrs["__class__"] = sys.intern(attrs["__class__"])
+    for k in cls._foreign_keys:
+        v = attrs.get(k)
+        if type(v) is str:
+            attrs[k] = sys.intern(v)
+        elif type(v) is list:
+            attrs[k] = [sys.intern(x) if type(x) is str else x for x in v]
+
+
+class DateTimeField:
+    """Represent a datetime attribute that may hold an unparsed string.
+
+    Strings are parsed on first read and the result replaces them in the
+    instance __dict__, so objects never read skip parsing altogether.
+    """
+
+    def __set_name__(self, owner, name):
+        """Remember the attribute name the field is stored under."""
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        """Return the datetime, parsing it first if needed."""
+        if obj is None:
+            return self
+        try:
+            value = obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if isinstance(value, str):
+            value = obj.__dict__[self.name] = parse_datetime(value)
+        return value
+
+    def __set__(self, obj, value):
+        """Store value in the instance __dict__."""
+        obj.__dict__[self.name] = value
+
+
+class ModelMeta(type):
+    """Build the model classes.
+
+    The declared public attributes of a class (e.g. Place.price_by_night)
+    and those of its bases are gathered in its _defaults dict; its
+    _foreign_keys and those of its bases are merged into one dict.
+    A declared list (e.g. Place.amenity_ids) stays a list in _defaults,
+    but instances read an empty tuple until they set their own list,
+    so the shared default cannot be changed in place. In compact mode
+    the declared attributes, and the DateTimeField attributes, become
+    __slots__ instead of class attributes; their values then stay
+    readable on instances through BaseModel.__getattr__(), and from the
+    class in _defaults.
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        """Create a model class, with __slots__ in compact mode."""
+        defaults = {}
+        fks = {}
+        for base in reversed(bases):
+            defaults.update(getattr(base, "_defaults", {}))
+            fks.update(getattr(base, "_foreign_keys", {}))
+        fks.update(namespace.get("_foreign_keys", {}))
+        declared = {k: v for k, v in namespace.items()
+                    if not k.startswith("_") and
+                    isinstance(v, (str, int, float, list))}
+        defaults.update(declared)
+        namespace["_defaults"] = defaults
+        namespace["_foreign_keys"] = fks
+        for k, v in declared.items():
+            if type(v) is list:
+                namespace[k] = tuple(v)
+        if COMPACT:
+            fields = [k for k, v in namespace.items()
+                      if isinstance(v, DateTimeField)]
+            for k in fields + list(declared):
+                del namespace[k]
+            namespace["__slots__"] = (tuple(namespace.get("__slots__", ())) +
+                                      tuple(fields) + tuple(declared))
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class BaseModel(metaclass=ModelMeta):
+    """Represents the BaseModel of the HBnB project.
+
+    In compact mode (HBNB_COMPACT_MODELS=1) instances have no __dict__:
+    id, the datetimes and the declared attributes of each class are
+    __slots__ and any other attribute goes to an overflow dict, _extra.
+    to_dict() and __str__ list the attributes in the order they were
+    first set, as in normal mode. Lazy datetimes are not available in
+    compact mode.
+
+    Attributes:
+        _foreign_keys (dict): The name of the class referenced by each
+            attribute holding the id, or a list of ids, of other
+            objects, by attribute name; their str values are interned.
+        _text_fields (tuple): Names of the str attributes whose words
+            storage search() looks up.
+        __lazy_datetimes (bool): Whether created_at and updated_at read
+            from kwargs are only parsed when first accessed.
+    """
+
+    _foreign_keys = {}
+    _text_fields = ()
+
+    __lazy_datetimes = (not COMPACT and
+                        os.getenv("HBNB_LAZY_DATETIMES") == "1")
+    created_at = DateTimeField()
+    updated_at = DateTimeField()
+
+    if COMPACT:
+        __slots__ = ("id", "_extra", "_shape")
+        __shapes = {}
+
+        def __getattr__(self, name):
+            """Return an overflow attribute or a declared default."""
+            if name not in ("_extra", "_shape"):
+                try:
+                    return self._extra[name]
+                except (AttributeError, KeyError):
+                    pass
+                if name in self._defaults:
+                    value = self._defaults[name]
+                    return tuple(value) if type(value) is list else value
+            raise AttributeError("'{}' object has no attribute '{}'"
+                                 .format(self.__class__.__name__, name))
+
+        def _store(self, name, value):
+            """Set an attribute without marking the instance as changed.
+
+            The names set are kept in _shape, in the order they were
+            first set, like the keys of a __dict__; instances set in the
+            same order share one _shape tuple.
+            """
+            try:
+                shape = object.__getattribute__(self, "_shape")
+            except AttributeError:
+                shape = ()
+            if name not in shape:
+                step = (shape, name)
+                shape = BaseModel.__shapes.get(step)
+                if shape is None:
+                    shape = BaseModel.__shapes[step] = step[0] + (name,)
+                object.__setattr__(self, "_shape", shape)
+            try:
+                object.__setattr__(self, name, value)
+            except AttributeError:
+                try:
+                    extra = object.__getattribute__(self, "_extra")
+                except AttributeError:
+                    extra = {}
+                    object.__setattr__(self, "_extra", extra)
+                extra[name] = value
+
+        def _attributes(self):
+            """Return a new dict of the attributes of the instance, in
+            the order they were first set."""
+            try:
+                extra = object.__getattribute__(self, "_extra")
+            except AttributeError:
+                extra = {}
+            attrs = {}
+            for k in self._shape:
+                attrs[k] = (extra[k] if k in extra
+                            else object.__getattribute__(self, k))
+            return attrs
+
+    else:
+        _store = object.__setattr__
+
+        def _attributes(self):
+            """Return the __dict__ of the instance."""
+            return self.__dict__
+
+    def __init_subclass__(cls, **kwargs):
+        """Register a new model class in classes."""
+        super().__init_subclass__(**kwargs)
+        classes[cls.__name__] = cls
 
     def __init__(self, *args, **kwargs):
         """Initialize a new BaseModel.
@@ -15,19 +221,83 @@ class BaseModel:
             *args (any): Unused.
             **kwargs (dict): Key/value pairs of attributes.
         """
-        tform = "%Y-%m-%dT%H:%M:%S.%f"
-        self.id = str(uuid4())
-        self.created_at = datetime.today()
-        self.updated_at = datetime.today()
+        store = self._store
         if len(kwargs) != 0:
-            for k, v in kwargs.items():
-                if k == "created_at" or k == "updated_at":
-                    self.__dict__[k] = datetime.strptime(v, tform)
+            # Store id and the datetimes first, so they lead the output
+            # as for new instances; only those kwargs lacks are made.
+            now = None
+            for k in ("id", "created_at", "updated_at"):
+                if k in kwargs:
+                    v = kwargs[k]
+                    if k != "id":
+                        if not BaseModel.__lazy_datetimes:
+                            v = parse_datetime(v)
+                        elif not isinstance(v, str):
+                            raise TypeError("{} must be a str".format(k))
+                elif k == "id":
+                    v = str(uuid4())
                 else:
-                    self.__dict__[k] = v
+                    now = now or datetime.today()
+                    v = now
+                store(k, v)
+            for k, v in kwargs.items():
+                if k not in ("__class__", "id", "created_at", "updated_at"):
+                    store(k, v)
         else:
+            now = datetime.today()
+            store("id", str(uuid4()))
+            store("created_at", now)
+            store("updated_at", now)
             models.storage.new(self)
 
+    @classmethod
+    def from_dict(cls, odict):
+        """Return an instance rebuilt from a dictionary made by to_dict().
+
+        Unlike cls(**odict), __init__ is skipped: no default id or
+        datetimes are generated and the attributes are written with a
+        single __dict__.update() (one slot at a time in compact mode).
+        The instance is not added to storage.
+
+        Args:
+            odict (dict): The attributes of the instance; a __class__
+                key is ignored.
+        """
+        obj = cls.__new__(cls)
+        if COMPACT:
+            fks = cls._foreign_keys
+            for k, v in odict.items():
+                if k in fks and type(v) is str:
+                    v = sys.intern(v)
+                if k != "__class__":
+                    obj._store(k, v)
+            obj._store("created_at", parse_datetime(odict["created_at"]))
+            obj._store("updated_at", parse_datetime(odict["updated_at"]))
+            return obj
+        attrs = obj.__dict__
+        attrs.update(odict)
+        attrs.pop("__class__", None)
+        intern_keys(cls, attrs)
+        if not BaseModel.__lazy_datetimes:
+            attrs["created_at"] = parse_datetime(attrs["created_at"])
+            attrs["updated_at"] = parse_datetime(attrs["updated_at"])
+        return obj
+
+    def __setattr__(self, name, value):
+        """Set an attribute and mark the instance as changed in storage.
+
+        Mutating an attribute in place (e.g. appending to a list) is not
+        seen; call models.storage.touch() or save() afterwards.
+        """
+        if name in self._foreign_keys and type(value) is str:
+            value = sys.intern(value)
+        if COMPACT:
+            self._store(name, value)
+        else:
+            super().__setattr__(name, value)
+        if getattr(self, "id", None) is not None:
+            models.storage.touch(self)
+
     def save(self):
         """Update updated_at with the current datetime."""
         self.updated_at = datetime.today()
@@ -39,13 +309,19 @@ class BaseModel:
         Includes the key/value pair __class__ representing
         the class name of the object.
         """
-        rdict = self.__dict__.copy()
-        rdict["created_at"] = self.created_at.isoformat()
-        rdict["updated_at"] = self.updated_at.isoformat()
+        rdict = self._attributes().copy()
+        for k in ("created_at", "updated_at"):
+            if not isinstance(rdict[k], str):
+                rdict[k] = rdict[k].isoformat()
         rdict["__class__"] = self.__class__.__name__
         return rdict
 
     def __str__(self):
         """Return the print/str representation of the BaseModel instance."""
         clname = self.__class__.__name__
-        return "[{}] ({}) {}".format(clname, self.id, self.__dict__)
+        # Parse lazy datetimes so they print like eager ones.
+        self.created_at, self.updated_at
+        return "[{}] ({}) {}".format(clname, self.id, self._attributes())
+
+
+classes["BaseModel"] = BaseModel
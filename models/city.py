@@ -11,5 +11,6 @@ class City(BaseModel):
         name (str): The name of the city.
     """
 
+    _foreign_keys = {"state_id": "State"}
     state_id = ""
     name = ""
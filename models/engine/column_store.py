@@ -0,0 +1,266 @@
+#!/usr/bin/python3
+"""Defines the ColumnStore, Table and Row classes."""
+import sys
+from array import array
+from itertools import compress
+from models.base_model import classes as model_classes
+
+
+class Row:
+    """Represent one object of a Table without instantiating it.
+
+    Attributes are read from the columns of the table on access.
+
+    Attributes:
+        table (Table): The table holding the object.
+        index (int): The position of the object in the table.
+    """
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        """Initialize a new Row.
+
+        Args:
+            table (Table): The table holding the object.
+            index (int): The position of the object in the table.
+        """
+        self.table = table
+        self.index = index
+
+    def __getattr__(self, name):
+        """Return an attribute of the object."""
+        return self.table.value(self.index, name)
+
+    def to_dict(self):
+        """Return a dictionary equal to the one the object was added with."""
+        return self.table.record(self.index)
+
+    def materialize(self):
+        """Return a model instance of the object, not added to storage."""
+        return self.table.cls.from_dict(self.to_dict())
+
+    def __str__(self):
+        """Return the print/str representation of the object."""
+        return str(self.materialize())
+
+
+class Table:
+    """Represent the objects of one model class as columns.
+
+    Each declared attribute of the class is a column: an array of
+    signed 64-bit integers for int attributes, of doubles for float
+    attributes, and a list of interned strings for str attributes.
+    Objects that do not set an attribute hold the class default in its
+    column, so aggregations see what getattr() would return. Other
+    attributes, and values that do not fit their column's type, are
+    kept in a per-object overflow dict; values() and the aggregations
+    read those values in place of the column's.
+
+    Attributes:
+        cls (type): The model class of the objects.
+        ids (list): The id of each object, in insertion order.
+    """
+
+    __codes = {int: "q", float: "d"}
+
+    def __init__(self, cls):
+        """Initialize a new Table.
+
+        Args:
+            cls (type): The model class of the objects.
+        """
+        self.cls = cls
+        self.ids = []
+        self.__index = {}
+        self.__dates = ([], [])
+        self.__columns = {}
+        self.__present = {}
+        self.__misfits = {}
+        self.__extra = []
+        for name, default in cls._defaults.items():
+            code = Table.__codes.get(type(default))
+            self.__columns[name] = array(code) if code else []
+            self.__present[name] = bytearray()
+            self.__misfits[name] = {}
+
+    def __len__(self):
+        """Return the number of objects in the table."""
+        return len(self.ids)
+
+    def __iter__(self):
+        """Iterate over a Row of each object."""
+        return (Row(self, i) for i in range(len(self.ids)))
+
+    def add(self, odict):
+        """Append the object of a dictionary made by to_dict().
+
+        Args:
+            odict (dict): The attributes of the object; a __class__ key
+                is ignored.
+        """
+        index = len(self.ids)
+        self.__index[odict["id"]] = index
+        self.ids.append(odict["id"])
+        self.__dates[0].append(odict["created_at"])
+        self.__dates[1].append(odict["updated_at"])
+        defaults = self.cls._defaults
+        extra = {}
+        for name, column in self.__columns.items():
+            value = odict.get(name, defaults[name])
+            present = name in odict
+            if isinstance(column, array):
+                if type(value) is not type(defaults[name]):
+                    extra[name] = self.__misfits[name][index] = value
+                    value = defaults[name]
+                    present = False
+                try:
+                    column.append(value)
+                except OverflowError:
+                    column.append(defaults[name])
+                    extra[name] = self.__misfits[name][index] = value
+                    present = False
+            else:
+                if type(value) is str:
+                    value = sys.intern(value)
+                column.append(value)
+            self.__present[name].append(present)
+        for k, v in odict.items():
+            if (k not in self.__columns and k != "__class__" and
+                    k not in ("id", "created_at", "updated_at")):
+                extra[k] = v
+        self.__extra.append(extra or None)
+
+    def row(self, id):
+        """Return the Row of the object with the given id, or None."""
+        index = self.__index.get(id)
+        return None if index is None else Row(self, index)
+
+    def rows(self, indices):
+        """Return the Row of each position in indices."""
+        return [Row(self, i) for i in indices]
+
+    def column(self, name):
+        """Return the column of a declared attribute.
+
+        The column is shared with the table and must not be modified.
+        Values that did not fit it hold the class default; see values().
+        """
+        return self.__columns[name]
+
+    def values(self, name):
+        """Return the value of a declared attribute for each object.
+
+        This is the column itself, unless some values did not fit it:
+        then a new list of the column is returned, with those values.
+        """
+        column = self.__columns[name]
+        misfits = self.__misfits[name]
+        if not misfits:
+            return column
+        values = list(column)
+        for index, value in misfits.items():
+            values[index] = value
+        return values
+
+    def value(self, index, name):
+        """Return an attribute of the object at a position."""
+        if name == "id":
+            return self.ids[index]
+        if name in ("created_at", "updated_at"):
+            return self.__dates[name == "updated_at"][index]
+        extra = self.__extra[index]
+        if extra is not None and name in extra:
+            return extra[name]
+        if name in self.__columns:
+            return self.__columns[name][index]
+        raise AttributeError("'{}' row has no attribute '{}'"
+                             .format(self.cls.__name__, name))
+
+    def record(self, index):
+        """Return the dictionary of the object at a position."""
+        rdict = {"id": self.ids[index],
+                 "created_at": self.__dates[0][index],
+                 "updated_at": self.__dates[1][index]}
+        for name, column in self.__columns.items():
+            if self.__present[name][index]:
+                rdict[name] = column[index]
+        extra = self.__extra[index]
+        if extra is not None:
+            rdict.update(extra)
+        rdict["__class__"] = self.cls.__name__
+        return rdict
+
+    def where(self, name, test):
+        """Return the positions of the objects whose attribute passes test.
+
+        Args:
+            name (str): A declared attribute.
+            test (callable): Called with each value of the column.
+        """
+        values = self.values(name)
+        return list(compress(range(len(values)), map(test, values)))
+
+    def sum(self, name):
+        """Return the sum of a numeric column.
+
+        Raises:
+            TypeError: If a value of the attribute is not a number.
+        """
+        return sum(self.values(name))
+
+    def min(self, name):
+        """Return the smallest value of a column."""
+        return min(self.values(name))
+
+    def max(self, name):
+        """Return the largest value of a column."""
+        return max(self.values(name))
+
+    def mean(self, name):
+        """Return the mean of a numeric column.
+
+        Raises:
+            TypeError: If a value of the attribute is not a number.
+            ValueError: If the table is empty.
+        """
+        if len(self.ids) == 0:
+            raise ValueError("mean of an empty table")
+        return self.sum(name) / len(self.ids)
+
+
+class ColumnStore:
+    """Represent stored objects as one Table per model class.
+
+    A ColumnStore is a read-only snapshot: it is filled from the
+    dictionaries of the objects (see FileStorage.columns()) and is not
+    updated when the stored objects change.
+    """
+
+    def __init__(self):
+        """Initialize a new ColumnStore."""
+        self.__tables = {}
+
+    def add(self, odict):
+        """Add the object of a dictionary made by to_dict()."""
+        name = odict["__class__"]
+        table = self.__tables.get(name)
+        if table is None:
+            table = self.__tables[name] = Table(model_classes[name])
+        table.add(odict)
+
+    def table(self, cls):
+        """Return the Table of a class, empty if no object was added.
+
+        Args:
+            cls (type or str): The model class, or its name.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        table = self.__tables.get(name)
+        if table is None:
+            table = self.__tables[name] = Table(model_classes[name])
+        return table
+
+    def __len__(self):
+        """Return the number of objects in the store."""
+        return sum(len(t) for t in self.__tables.values())
@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""Defines the Compactor class."""
+import threading
+
+
+class Compactor(threading.Thread):
+    """Represent a background thread that compacts a storage journal.
+
+    Attributes:
+        storage (FileStorage): The storage engine to compact.
+        interval (float): Seconds between two compaction checks.
+    """
+
+    def __init__(self, storage, interval=60.0):
+        """Initialize a new Compactor.
+
+        Args:
+            storage (FileStorage): The storage engine to compact.
+            interval (float): Seconds between two compaction checks.
+        """
+        super().__init__(name="hbnb-compactor", daemon=True)
+        self.storage = storage
+        self.interval = interval
+        self.__stopped = threading.Event()
+
+    def run(self):
+        """Compact the storage whenever its journal crosses a threshold."""
+        while not self.__stopped.wait(self.interval):
+            if self.storage.needs_compaction():
+                self.storage.compact()
+
+    def stop(self):
+        """Stop checking the journal and wait for the thread to finish."""
+        self.__stopped.set()
+        self.join()
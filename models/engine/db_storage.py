@@ -0,0 +1,460 @@
+#!/usr/bin/python3
+"""Defines the DBStorage class."""
+import heapq
+import json
+import operator
+import os
+import sqlite3
+import threading
+from itertools import chain, islice
+from models.base_model import classes as model_classes
+from models.engine.column_store import ColumnStore
+from models.engine.grid_index import distance
+from models.engine.text_index import TextIndex
+from models.engine.query import Query
+
+
+class DBStorage:
+    """Represent a SQLite storage engine.
+
+    Every model class gets its own table, with one column per declared
+    class attribute and an "extra" column holding any other attribute
+    as JSON, as well as any value not of the type of its column (None
+    included). An "_order" column lists the attribute names in the
+    order they were set, so objects reload exactly as saved. Objects
+    are kept in memory like in FileStorage; save() only writes the rows
+    of objects changed since the last save.
+
+    Attributes:
+        __db_path (str): The name of the SQLite database file.
+        __compact_bytes (int): WAL size that triggers a checkpoint.
+    """
+    __db_path = os.getenv("HBNB_DB_PATH", "hbnb.db")
+    __compact_bytes = int(os.getenv("HBNB_COMPACT_BYTES", 16 << 20))
+    __types = {str: "TEXT", int: "INTEGER", float: "REAL", list: "TEXT"}
+
+    def __init__(self):
+        """Initialize a new DBStorage."""
+        self.__objects = {}
+        self.__classes = {}
+        self.__pending = set()
+        self.__lock = threading.RLock()
+        self.__conn = None
+        self.__columns = {}
+        self.__sql = {}
+
+    def all(self, cls=None):
+        """Return the dictionary of stored objects, or of those of a class.
+
+        Args:
+            cls (type or str): The class of the objects, or its name. If
+                given, a new dictionary holding only the objects of that
+                class is returned.
+        """
+        if cls is None:
+            return self.__objects
+        name = cls if isinstance(cls, str) else cls.__name__
+        with self.__lock:
+            return dict(self.__classes.get(name, {}))
+
+    def count(self, cls=None):
+        """Return the number of stored objects, or of objects of a class.
+
+        Args:
+            cls (type or str): The class of the objects, or its name.
+        """
+        if cls is None:
+            return len(self.__objects)
+        name = cls if isinstance(cls, str) else cls.__name__
+        return len(self.__classes.get(name, ()))
+
+    def keys(self, cls=None, *, after=None, offset=0, limit=None):
+        """Return the keys of the objects of a class, in the order of
+        all(cls), or of every stored object, class by class.
+
+        Args:
+            cls (type or str): The class of the objects, or its name.
+            after (str): A key; if given, start with the key after it.
+                Finding it takes a scan of the keys before it, but none
+                of their objects is read.
+            offset (int): The number of keys to skip.
+            limit (int): The maximum number of keys to return.
+        Returns:
+            A list of keys.
+        Raises:
+            KeyError: If after is not one of the keys.
+        """
+        stop = None if limit is None else offset + limit
+        with self.__lock:
+            if cls is None:
+                keys = chain.from_iterable(self.__classes.values())
+            else:
+                name = cls if isinstance(cls, str) else cls.__name__
+                keys = iter(self.__classes.get(name, {}))
+            if after is not None:
+                try:
+                    operator.indexOf(keys, after)
+                except ValueError:
+                    raise KeyError(after) from None
+            return list(islice(keys, offset, stop))
+
+    def children(self, parent, cls):
+        """Return the stored objects of a class that reference parent.
+
+        Args:
+            parent (BaseModel): The referenced object.
+            cls (type or str): The class of the objects, or its name.
+        Returns:
+            A new dictionary of the objects, by key.
+        """
+        return self.children_of_all([parent], cls)
+
+    def children_of_all(self, parents, cls):
+        """Return the stored objects of a class that reference every
+        one of parents.
+
+        Args:
+            parents (iterable): The referenced objects.
+            cls (type or str): The class of the objects, or its name.
+        Returns:
+            A new dictionary of the objects, by key.
+        """
+        cls = cls if not isinstance(cls, str) else model_classes[cls]
+        tests = [([attr for attr, target in cls._foreign_keys.items()
+                   if target == p.__class__.__name__], p.id)
+                 for p in parents]
+        with self.__lock:
+            return {key: obj for key, obj
+                    in self.__classes.get(cls.__name__, {}).items()
+                    if all(any(self.__references(obj, attr, pid)
+                               for attr in attrs)
+                           for attrs, pid in tests)}
+
+    def query(self, cls):
+        """Return a new Query over the objects of a class.
+
+        The database keeps no indexes, so the query scans the class.
+
+        Args:
+            cls (type or str): The class of the objects, or its name.
+        """
+        return Query(self, cls, indexed=False)
+
+    def ids_in_range(self, cls, attr, low=None, high=None, *,
+                     reverse=False, limit=None):
+        """Return the ids of the objects of a class by a numeric attribute.
+
+        Args:
+            cls (type or str): The class of the objects, or its name.
+            attr (str): A declared int or float attribute of cls.
+            low (int or float): The smallest value, or None for no bound.
+            high (int or float): The largest value, or None for no bound.
+            reverse (bool): Whether to return the largest values first.
+            limit (int): The maximum number of ids to return.
+        Returns:
+            A list of ids, ordered by value, then by id.
+        Raises:
+            ValueError: If attr is not a numeric attribute of cls.
+        """
+        cls = cls if not isinstance(cls, str) else model_classes[cls]
+        if type(cls._defaults.get(attr)) not in (int, float):
+            raise ValueError("{} is not a numeric attribute of {}".format(
+                attr, cls.__name__))
+        with self.__lock:
+            pairs = [(v, obj.id) for obj
+                     in self.__classes.get(cls.__name__, {}).values()
+                     for v in (getattr(obj, attr, None),)
+                     if type(v) in (int, float) and v == v and
+                     (low is None or v >= low) and
+                     (high is None or v <= high)]
+        if limit is None:
+            pairs.sort(reverse=reverse)
+        elif reverse:
+            pairs = heapq.nlargest(limit, pairs)
+        else:
+            pairs = heapq.nsmallest(limit, pairs)
+        return [oid for _, oid in pairs]
+
+    def within(self, cls, latitude, longitude, km):
+        """Return the ids of the objects of a class within km of a point.
+
+        Args:
+            cls (type or str): A class with float latitude and longitude
+                attributes (e.g. Place), or its name.
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            km (float): The radius, in kilometers.
+        Returns:
+            A list of ids, nearest first.
+        Raises:
+            ValueError: If cls has no latitude and longitude.
+        """
+        return [oid for d, oid in sorted(self.__distances(
+            cls, latitude, longitude)) if d <= km]
+
+    def nearest(self, cls, latitude, longitude, k):
+        """Return the ids of the k objects of a class nearest to a point.
+
+        Args:
+            cls (type or str): A class with float latitude and longitude
+                attributes (e.g. Place), or its name.
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            k (int): The number of ids to return.
+        Returns:
+            A list of ids, nearest first.
+        Raises:
+            ValueError: If cls has no latitude and longitude.
+        """
+        return [oid for _, oid in heapq.nsmallest(k, self.__distances(
+            cls, latitude, longitude))]
+
+    def __distances(self, cls, latitude, longitude):
+        """Return (distance, id) pairs of the located objects of cls."""
+        cls = cls if not isinstance(cls, str) else model_classes[cls]
+        if (type(cls._defaults.get("latitude")) is not float or
+                type(cls._defaults.get("longitude")) is not float):
+            raise ValueError("{} has no latitude and longitude".format(
+                cls.__name__))
+        with self.__lock:
+            objs = list(self.__classes.get(cls.__name__, {}).values())
+        return [(distance(latitude, longitude, lat, lon), obj.id)
+                for obj in objs
+                for lat, lon in ((obj.latitude, obj.longitude),)
+                if type(lat) in (int, float) and type(lon) in (int, float)
+                and -90 <= lat <= 90 and -180 <= lon <= 180]
+
+    def search(self, query, cls=None, *, limit=None):
+        """Return the stored objects whose text fields match query.
+
+        Objects holding any word of query are ranked with BM25, over an
+        index built for the query.
+
+        Args:
+            query (str): The words to look for.
+            cls (type or str): The class of the objects, or its name; if
+                None, every class with text fields is searched.
+            limit (int): The maximum number of objects to return.
+        Returns:
+            A new dictionary of the objects, by key, best match first.
+        """
+        name = cls if cls is None or isinstance(cls, str) else cls.__name__
+        index = TextIndex()
+        with self.__lock:
+            objs = dict(self.__objects)
+        for key, obj in objs.items():
+            fields = obj._text_fields
+            if fields and (name is None or key.startswith(name + ".")):
+                texts = (getattr(obj, f, "") for f in fields)
+                index.update(key, tuple(t for t in texts
+                                        if isinstance(t, str)))
+        return {key: objs[key] for _, key in index.search(query, limit)}
+
+    def __references(self, obj, attr, pid):
+        """Return True if the attribute attr of obj holds the id pid."""
+        value = getattr(obj, attr, None)
+        if type(value) is list:
+            return pid in value
+        return value == pid
+
+    def get(self, cls, id):
+        """Return the stored object of a class with the given id.
+
+        Args:
+            cls (type or str): The class of the object, or its name.
+            id (str): The id of the object.
+        Returns:
+            The object, or None if it is not stored.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        return self.__objects.get("{}.{}".format(name, id))
+
+    def new(self, obj):
+        """Set in the stored objects obj with key <obj_class_name>.id"""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            self.__objects[key] = obj
+            self.__classes.setdefault(obj.__class__.__name__, {})[key] = obj
+            self.__pending.add(key)
+
+    def touch(self, obj):
+        """Mark obj as changed since the last save, if it is stored."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            if key in self.__objects:
+                self.__pending.add(key)
+
+    def delete(self, obj):
+        """Remove obj from the stored objects, if it is stored."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            if self.__objects.pop(key, None) is not None:
+                self.__classes[obj.__class__.__name__].pop(key, None)
+                self.__pending.add(key)
+
+    def save(self):
+        """Write the objects changed since the last save in one
+        transaction."""
+        with self.__lock:
+            if self.__conn is None:
+                self.__connect()
+            puts = {}
+            deletes = {}
+            for key in self.__pending:
+                cls_name, oid = key.split(".", 1)
+                if cls_name not in self.__columns:
+                    if cls_name not in model_classes:
+                        continue
+                    self.__create_table(model_classes[cls_name])
+                if key in self.__objects:
+                    row = self.__to_row(self.__objects[key])
+                    puts.setdefault(cls_name, []).append(row)
+                else:
+                    deletes.setdefault(cls_name, []).append((oid,))
+            with self.__conn:
+                for cls_name, rows in deletes.items():
+                    self.__conn.executemany(self.__sql[cls_name][1], rows)
+                for cls_name, rows in puts.items():
+                    self.__conn.executemany(self.__sql[cls_name][0], rows)
+            self.__pending.clear()
+
+    def reload(self, *, classes=None):
+        """Load the rows of the model tables into the stored objects.
+
+        Args:
+            classes (iterable): The classes (or class names) to load;
+                every class is loaded if None.
+        """
+        names = None
+        if classes is not None:
+            names = {c if isinstance(c, str) else c.__name__
+                     for c in classes}
+        with self.__lock:
+            if self.__conn is None:
+                self.__connect()
+            for cls in list(model_classes.values()):
+                if names is not None and cls.__name__ not in names:
+                    continue
+                if cls.__name__ not in self.__columns:
+                    self.__create_table(cls)
+                cols = self.__columns[cls.__name__]
+                cur = self.__conn.execute(self.__sql[cls.__name__][2])
+                for row in cur:
+                    self.new(cls.from_dict(self.__from_row(cols, row)))
+            self.__pending.clear()
+
+    def columns(self):
+        """Return a ColumnStore snapshot of the stored objects."""
+        store = ColumnStore()
+        with self.__lock:
+            for obj in self.__objects.values():
+                store.add(obj.to_dict())
+        return store
+
+    def needs_compaction(self):
+        """Return True if the write-ahead log should be checkpointed."""
+        try:
+            size = os.path.getsize(DBStorage.__db_path + "-wal")
+        except OSError:
+            return False
+        return size >= DBStorage.__compact_bytes
+
+    def compact(self):
+        """Checkpoint the write-ahead log into the database file."""
+        with self.__lock:
+            if self.__conn is None:
+                self.__connect()
+            self.__conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return True
+
+    def close(self):
+        """Close the database connection."""
+        with self.__lock:
+            if self.__conn is not None:
+                self.__conn.close()
+                self.__conn = None
+
+    def __connect(self):
+        """Open the database and create or extend the model tables."""
+        conn = sqlite3.connect(DBStorage.__db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self.__conn = conn
+        for cls in list(model_classes.values()):
+            self.__create_table(cls)
+
+    def __create_table(self, cls):
+        """Create or extend the table of cls.
+
+        Called for every model class when the database is opened, and
+        by save() and reload() for the classes defined since then.
+        """
+        conn = self.__conn
+        cols = [(k, v.__class__) for k, v in cls._defaults.items()
+                if v.__class__ in DBStorage.__types]
+        conn.execute('CREATE TABLE IF NOT EXISTS "{}" (id TEXT PRIMARY '
+                     'KEY, created_at TEXT, updated_at TEXT, extra TEXT)'
+                     .format(cls.__name__))
+        have = {r[1] for r in conn.execute('PRAGMA table_info("{}")'
+                                           .format(cls.__name__))}
+        for name, typ in cols + [("_order", list)]:
+            if name not in have:
+                conn.execute('ALTER TABLE "{}" ADD COLUMN "{}" {}'.format(
+                    cls.__name__, name, DBStorage.__types[typ]))
+        names = ["id", "created_at", "updated_at"]
+        names += [name for name, _ in cols] + ["extra", "_order"]
+        self.__columns[cls.__name__] = cols
+        quoted = ", ".join('"{}"'.format(n) for n in names)
+        self.__sql[cls.__name__] = (
+            'INSERT OR REPLACE INTO "{}" ({}) VALUES ({})'.format(
+                cls.__name__, quoted, ", ".join("?" * len(names))),
+            'DELETE FROM "{}" WHERE id = ?'.format(cls.__name__),
+            'SELECT {} FROM "{}"'.format(quoted, cls.__name__))
+        conn.commit()
+
+    def __to_row(self, obj):
+        """Return the parameters of the upsert statement for obj."""
+        odict = obj.to_dict()
+        del odict["__class__"]
+        order = list(odict)
+        row = [odict.pop("id"), odict.pop("created_at"),
+               odict.pop("updated_at")]
+        for name, typ in self.__columns[obj.__class__.__name__]:
+            if name not in odict or not self.__fits(odict[name], typ):
+                row.append(None)
+            elif typ is list:
+                row.append(json.dumps(odict.pop(name)))
+            else:
+                row.append(odict.pop(name))
+        row.append(json.dumps(odict) if odict else None)
+        row.append(json.dumps(order))
+        return row
+
+    @staticmethod
+    def __fits(value, typ):
+        """Return True if value can be stored in a column of type typ and
+        read back unchanged."""
+        if type(value) is not typ:
+            return False
+        if typ is int:
+            return -(1 << 63) <= value < 1 << 63
+        if typ is float:
+            # SQLite stores NaN as NULL.
+            return value == value
+        return True
+
+    def __from_row(self, cols, row):
+        """Return the keyword arguments rebuilding the object of row.
+
+        Rows written before the "_order" column existed have no NULL
+        values, so their NULL columns are left out.
+        """
+        kwargs = {"id": row[0], "created_at": row[1], "updated_at": row[2]}
+        for (name, typ), value in zip(cols, row[3:-2]):
+            if value is not None:
+                kwargs[name] = json.loads(value) if typ is list else value
+        if row[-2] is not None:
+            kwargs.update(json.loads(row[-2]))
+        if row[-1] is not None:
+            kwargs = {name: kwargs[name] for name in json.loads(row[-1])}
+        return kwargs
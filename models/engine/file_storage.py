@@ -1,13 +1,18 @@
 #!/usr/bin/python3
 """Defines the FileStorage class."""
 import json
-from models.base_model import BaseModel
-from models.user import User
-from models.state import State
-from models.city import City
-from models.place import Place
-from models.amenity import Amenity
-from models.review import Review
+import operator
+import os
+import threading
+from itertools import chain, islice
+from models.engine.json_stream import iterload, dump_fragments
+from models.engine.flusher import Flusher
+from models.engine.column_store import ColumnStore
+from models.engine.sorted_index import SortedIndex
+from models.engine.grid_index import GridIndex
+from models.engine.text_index import TextIndex
+from models.engine.query import Query
+from models.base_model import classes as model_classes, intern_keys
 
 
 class FileStorage:
@@ -15,35 +20,938 @@ class FileStorage:
 
     Attributes:
         __file_path (str): The name of the file to save objects to.
+        __log_path (str): The name of the journal file changes are
+            appended to when journal mode is enabled.
         __objects (dict): A dictionary of instantiated objects.
+        __raw (dict): In lazy mode, the dictionaries of the objects that
+            were loaded but not instantiated yet, by key.
+        __journal (bool): Whether save appends changed objects to
+            __log_path instead of rewriting __file_path.
+        __lazy (bool): Whether reload defers instantiating objects until
+            they are first accessed.
+        __durability (str): How hard a save makes sure its data reached
+            the disk: "none" (atomic rename only), "flush" (fsync the
+            file before renaming it) or "fsync" (also fsync the
+            directory after the rename).
+        __write_behind (float): If positive, saves are written by a
+            background thread at most once every __write_behind seconds.
+        __sharded (bool): Whether objects are saved to one file per
+            class (<class name>.json) next to __file_path.
+        __loaded (set): Names of the classes loaded by the last
+            sharded reload, or None if every class was loaded.
+        __pending (set): Keys created, updated or deleted since the
+            last save.
+        __fragments (dict): Serialized JSON of each object as of the
+            last save, reused for objects that have not changed.
+        __compact_bytes (int): Journal size that triggers compaction.
+        __compact_ratio (float): Fraction of dead journal records that
+            triggers compaction.
+        __log_records (int): Number of records in the journal.
+        __log_keys (set): Keys that have a record in the journal.
+        __classes (dict): The keys of the stored objects of each class,
+            by class name, as dicts with None values to keep their order.
+        __children (dict): The keys of the stored objects referencing
+            each id, by id, for each (class name, foreign key) pair.
+        __parents (dict): The foreign key values each key is indexed
+            under in __children, by key; lists of ids are kept as
+            frozensets, so each Place has its own set of amenity ids.
+        __ranges (dict): The SortedIndex of each numeric attribute that
+            ids_in_range() was called for, by attribute name, by class
+            name.
+        __grids (dict): The GridIndex of the latitude and longitude of
+            each class that within() or nearest() was called for, by
+            class name.
+        __grid_size (float): The side of a GridIndex cell, in degrees;
+            it must divide 180.
+        __text (TextIndex): The words of the text fields of the stored
+            objects, by key, or None until search() is first called.
+        __classes_of (tuple): The __objects and __raw dicts the indexes
+            were built from; they are rebuilt if either was replaced.
+        __lock (RLock): Guards __objects, __pending and the journal.
     """
     __file_path = "file.json"
+    __log_path = "file.json.log"
     __objects = {}
+    __raw = {}
+    __journal = os.getenv("HBNB_FILE_JOURNAL") == "1"
+    __lazy = os.getenv("HBNB_FILE_LAZY") == "1"
+    __sharded = os.getenv("HBNB_FILE_SHARDED") == "1"
+    __durability = os.getenv("HBNB_FILE_DURABILITY", "none")
+    __write_behind = float(os.getenv("HBNB_FILE_WRITE_BEHIND", 0))
+    __flusher = None
+    __loaded = None
+    __pending = set()
+    __fragments = {}
+    __compact_bytes = int(os.getenv("HBNB_COMPACT_BYTES", 16 << 20))
+    __compact_ratio = float(os.getenv("HBNB_COMPACT_RATIO", 0.5))
+    __log_records = 0
+    __log_keys = set()
+    __classes = {}
+    __children = {}
+    __parents = {}
+    __ranges = {}
+    __grids = {}
+    __grid_size = float(os.getenv("HBNB_GRID_DEGREES", 0.5))
+    __text = None
+    __classes_of = (None, None)
+    __lock = threading.RLock()
+    __compacting = threading.Lock()
 
-    def all(self):
-        """Return the dictionary __objects."""
+    def all(self, cls=None):
+        """Return the dictionary __objects, or the objects of one class.
+
+        Args:
+            cls (type or str): The class of the objects, or its name. If
+                given, a new dictionary holding only the objects of that
+                class is returned, found through the class index.
+        """
+        if cls is not None:
+            with FileStorage.__lock:
+                keys = self.__class_keys(cls)
+                return {key: FileStorage.__objects.get(key) or
+                        self.__materialize(key) for key in keys}
+        if FileStorage.__raw:
+            with FileStorage.__lock:
+                for key in list(FileStorage.__raw):
+                    self.__materialize(key)
         return FileStorage.__objects
 
+    def count(self, cls=None):
+        """Return the number of stored objects, or of objects of a class.
+
+        Args:
+            cls (type or str): The class of the objects, or its name.
+        """
+        if cls is None:
+            return len(FileStorage.__objects) + len(FileStorage.__raw)
+        with FileStorage.__lock:
+            return len(self.__class_keys(cls))
+
+    def keys(self, cls=None, *, after=None, offset=0, limit=None):
+        """Return the keys of the objects of a class, in the order of
+        all(cls), or of every stored object, class by class.
+
+        No object is read, so in lazy mode only the objects later got
+        with get() are instantiated, and reading objects does not change
+        the order of the keys.
+
+        Args:
+            cls (type or str): The class of the objects, or its name.
+            after (str): A key; if given, start with the key after it.
+                Finding it takes a scan of the keys before it, but none
+                of their objects is read.
+            offset (int): The number of keys to skip.
+            limit (int): The maximum number of keys to return.
+        Returns:
+            A list of keys.
+        Raises:
+            KeyError: If after is not one of the keys.
+        """
+        stop = None if limit is None else offset + limit
+        with FileStorage.__lock:
+            if cls is None:
+                self.__refresh_indexes()
+                keys = chain.from_iterable(FileStorage.__classes.values())
+            else:
+                keys = iter(self.__class_keys(cls))
+            if after is not None:
+                try:
+                    operator.indexOf(keys, after)
+                except ValueError:
+                    raise KeyError(after) from None
+            return list(islice(keys, offset, stop))
+
+    def children(self, parent, cls):
+        """Return the stored objects of a class that reference parent.
+
+        The objects are found through the reverse index of the foreign
+        keys of cls that reference the class of parent (e.g. the Cities
+        whose state_id is the id of a State, or the Places whose
+        amenity_ids hold the id of an Amenity).
+
+        Args:
+            parent (BaseModel): The referenced object.
+            cls (type or str): The class of the objects, or its name.
+        Returns:
+            A new dictionary of the objects, by key.
+        """
+        with FileStorage.__lock:
+            keys = self.__referencing(parent, cls)
+            return {key: FileStorage.__objects.get(key) or
+                    self.__materialize(key) for key in keys}
+
+    def children_of_all(self, parents, cls):
+        """Return the stored objects of a class that reference every
+        one of parents (e.g. the Places having all of some Amenities).
+
+        The reverse indexes of the parents are intersected, starting
+        from the smallest one.
+
+        Args:
+            parents (iterable): The referenced objects.
+            cls (type or str): The class of the objects, or its name.
+        Returns:
+            A new dictionary of the objects, by key.
+        """
+        with FileStorage.__lock:
+            sets = sorted((self.__referencing(p, cls) for p in parents),
+                          key=len)
+            if not sets:
+                return self.all(cls)
+            return {key: FileStorage.__objects.get(key) or
+                    self.__materialize(key) for key in sets[0]
+                    if all(key in keys for keys in sets[1:])}
+
+    def lookup(self, cls, attr, id):
+        """Return the ids of the objects of a class whose foreign key
+        attr holds id, through its reverse index.
+
+        Args:
+            cls (type or str): The class of the objects, or its name.
+            attr (str): A foreign key of cls (e.g. "city_id").
+            id (str): The referenced id.
+        Returns:
+            A list of ids.
+        Raises:
+            ValueError: If attr is not a foreign key of cls.
+        """
+        cls = cls if not isinstance(cls, str) else model_classes[cls]
+        if attr not in cls._foreign_keys:
+            raise ValueError("{} is not a foreign key of {}".format(
+                attr, cls.__name__))
+        with FileStorage.__lock:
+            self.__refresh_indexes()
+            keys = FileStorage.__children.get((cls.__name__, attr), {})
+            return [key.split(".", 1)[1] for key in keys.get(id, ())]
+
+    def query(self, cls):
+        """Return a new Query over the objects of a class.
+
+        The query starts from the class, foreign key or range index that
+        leaves the fewest candidates (see Query).
+
+        Args:
+            cls (type or str): The class of the objects, or its name.
+        """
+        return Query(self, cls)
+
+    def ids_in_range(self, cls, attr, low=None, high=None, *,
+                     reverse=False, limit=None):
+        """Return the ids of the objects of a class by a numeric attribute.
+
+        The first call for an attribute builds a sorted index of it that
+        is then kept up to date, so later queries only read the ids they
+        return; top-N queries (e.g. the 10 most expensive Places) use
+        reverse and limit.
+
+        Args:
+            cls (type or str): The class of the objects, or its name.
+            attr (str): A declared int or float attribute of cls.
+            low (int or float): The smallest value, or None for no bound.
+            high (int or float): The largest value, or None for no bound.
+            reverse (bool): Whether to return the largest values first.
+            limit (int): The maximum number of ids to return.
+        Returns:
+            A list of ids, ordered by value, then by id.
+        Raises:
+            ValueError: If attr is not a numeric attribute of cls.
+        """
+        cls = cls if not isinstance(cls, str) else model_classes[cls]
+        if type(cls._defaults.get(attr)) not in (int, float):
+            raise ValueError("{} is not a numeric attribute of {}".format(
+                attr, cls.__name__))
+        with FileStorage.__lock:
+            self.__refresh_indexes()
+            ranges = FileStorage.__ranges.setdefault(cls.__name__, {})
+            index = ranges.get(attr)
+            if index is None:
+                index = ranges[attr] = SortedIndex()
+                for key in FileStorage.__classes.get(cls.__name__, ()):
+                    self.__index_ranges(key)
+            return index.ids(low, high, reverse, limit)
+
+    def within(self, cls, latitude, longitude, km):
+        """Return the ids of the objects of a class within km of a point.
+
+        The first call for a class builds a grid index of the latitude
+        and longitude of its objects that is then kept up to date, so
+        queries only visit the grid cells around the point.
+
+        Args:
+            cls (type or str): A class with float latitude and longitude
+                attributes (e.g. Place), or its name.
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            km (float): The radius, in kilometers.
+        Returns:
+            A list of ids, nearest first.
+        Raises:
+            ValueError: If cls has no latitude and longitude.
+        """
+        with FileStorage.__lock:
+            grid = self.__grid(cls)
+            return [id for _, id in grid.within(latitude, longitude, km)]
+
+    def nearest(self, cls, latitude, longitude, k):
+        """Return the ids of the k objects of a class nearest to a point.
+
+        Args:
+            cls (type or str): A class with float latitude and longitude
+                attributes (e.g. Place), or its name.
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            k (int): The number of ids to return.
+        Returns:
+            A list of ids, nearest first.
+        Raises:
+            ValueError: If cls has no latitude and longitude.
+        """
+        with FileStorage.__lock:
+            grid = self.__grid(cls)
+            return [id for _, id in grid.nearest(latitude, longitude, k)]
+
+    def __grid(self, cls):
+        """Return the grid index of a class, building it if needed."""
+        cls = cls if not isinstance(cls, str) else model_classes[cls]
+        if (type(cls._defaults.get("latitude")) is not float or
+                type(cls._defaults.get("longitude")) is not float):
+            raise ValueError("{} has no latitude and longitude".format(
+                cls.__name__))
+        self.__refresh_indexes()
+        grid = FileStorage.__grids.get(cls.__name__)
+        if grid is None:
+            grid = FileStorage.__grids[cls.__name__] = GridIndex(
+                FileStorage.__grid_size)
+            for key in FileStorage.__classes.get(cls.__name__, ()):
+                self.__index_grid(key)
+        return grid
+
+    def search(self, query, cls=None, *, limit=None):
+        """Return the stored objects whose text fields match query.
+
+        The first call builds an inverted index of the words of the text
+        fields (e.g. Place.name and description, Review.text) that is
+        then kept up to date. Objects holding any word of query are
+        ranked with BM25.
+
+        Args:
+            query (str): The words to look for.
+            cls (type or str): The class of the objects, or its name; if
+                None, every class with text fields is searched.
+            limit (int): The maximum number of objects to return.
+        Returns:
+            A new dictionary of the objects, by key, best match first.
+        """
+        accept = None
+        if cls is not None:
+            prefix = (cls if isinstance(cls, str) else cls.__name__) + "."
+            accept = (lambda key: key.startswith(prefix))
+        with FileStorage.__lock:
+            self.__refresh_indexes()
+            if FileStorage.__text is None:
+                FileStorage.__text = TextIndex()
+                for key in list(self.__keys()):
+                    self.__index_text(key)
+            ranked = FileStorage.__text.search(query, limit, accept)
+            return {key: FileStorage.__objects.get(key) or
+                    self.__materialize(key) for _, key in ranked}
+
+    def __referencing(self, parent, cls):
+        """Return the keys of the objects of cls that reference parent."""
+        cls = cls if not isinstance(cls, str) else model_classes[cls]
+        pname = parent.__class__.__name__
+        self.__refresh_indexes()
+        keys = {}
+        for attr, target in cls._foreign_keys.items():
+            if target == pname:
+                keys.update(FileStorage.__children.get(
+                    (cls.__name__, attr), {}).get(parent.id, {}))
+        return keys
+
+    def __class_keys(self, cls):
+        """Return the keys of the stored objects of a class, in order."""
+        self.__refresh_indexes()
+        name = cls if isinstance(cls, str) else cls.__name__
+        return FileStorage.__classes.get(name, ())
+
+    def __refresh_indexes(self):
+        """Rebuild the indexes if __objects or __raw was replaced."""
+        if (FileStorage.__classes_of[0] is not FileStorage.__objects or
+                FileStorage.__classes_of[1] is not FileStorage.__raw):
+            FileStorage.__classes = {}
+            FileStorage.__children = {}
+            FileStorage.__parents = {}
+            FileStorage.__ranges = {name: {attr: SortedIndex()
+                                           for attr in ranges}
+                                    for name, ranges
+                                    in FileStorage.__ranges.items()}
+            FileStorage.__grids = {name: GridIndex(FileStorage.__grid_size)
+                                   for name in FileStorage.__grids}
+            if FileStorage.__text is not None:
+                FileStorage.__text = TextIndex()
+            for key in self.__keys():
+                self.__index(key)
+            FileStorage.__classes_of = (FileStorage.__objects,
+                                        FileStorage.__raw)
+
+    def __index(self, key):
+        """Add key to the class, foreign key, range, grid and text
+        indexes."""
+        name = key.split(".", 1)[0]
+        keys = FileStorage.__classes.get(name)
+        if keys is None:
+            keys = FileStorage.__classes[name] = {}
+        keys[key] = None
+        self.__index_parents(key)
+        self.__index_ranges(key)
+        self.__index_grid(key)
+        self.__index_text(key)
+
+    def __index_parents(self, key):
+        """Bring the foreign key index of key up to date."""
+        name = key.split(".", 1)[0]
+        cls = model_classes.get(name)
+        if cls is None or not cls._foreign_keys:
+            return
+        obj = FileStorage.__objects.get(key)
+        if obj is not None:
+            refs = tuple(getattr(obj, attr, None)
+                         for attr in cls._foreign_keys)
+        else:
+            o = FileStorage.__raw[key]
+            refs = tuple(o.get(attr) for attr in cls._foreign_keys)
+        refs = tuple(frozenset(i for i in r if isinstance(i, str))
+                     if type(r) is list else r for r in refs)
+        old = FileStorage.__parents.get(key)
+        if old == refs:
+            return
+        self.__unindex_parents(key)
+        children = FileStorage.__children
+        for attr, ref in zip(cls._foreign_keys, refs):
+            for ref_id in self.__ref_ids(ref):
+                index = children.get((name, attr))
+                if index is None:
+                    index = children[(name, attr)] = {}
+                keys = index.get(ref_id)
+                if keys is None:
+                    keys = index[ref_id] = {}
+                keys[key] = None
+        FileStorage.__parents[key] = refs
+
+    def __ref_ids(self, ref):
+        """Return the ids held by a foreign key value as indexed: an id
+        or a frozenset of ids."""
+        if type(ref) is frozenset:
+            return [r for r in ref if r]
+        return (ref,) if ref and isinstance(ref, str) else ()
+
+    def __index_ranges(self, key):
+        """Bring the range indexes of key up to date."""
+        name, id = key.split(".", 1)
+        ranges = FileStorage.__ranges.get(name)
+        if not ranges:
+            return
+        obj = FileStorage.__objects.get(key)
+        if obj is not None:
+            for attr, index in ranges.items():
+                index.update(id, getattr(obj, attr, None))
+        else:
+            o = FileStorage.__raw[key]
+            defaults = model_classes[name]._defaults
+            for attr, index in ranges.items():
+                index.update(id, o.get(attr, defaults[attr]))
+
+    def __index_grid(self, key):
+        """Bring the grid index of key up to date."""
+        name, id = key.split(".", 1)
+        grid = FileStorage.__grids.get(name)
+        if grid is None:
+            return
+        obj = FileStorage.__objects.get(key)
+        if obj is not None:
+            grid.update(id, getattr(obj, "latitude", None),
+                        getattr(obj, "longitude", None))
+        else:
+            o = FileStorage.__raw[key]
+            defaults = model_classes[name]._defaults
+            grid.update(id, o.get("latitude", defaults["latitude"]),
+                        o.get("longitude", defaults["longitude"]))
+
+    def __index_text(self, key):
+        """Bring the text index of key up to date."""
+        if FileStorage.__text is None:
+            return
+        cls = model_classes.get(key.split(".", 1)[0])
+        if cls is None or not cls._text_fields:
+            return
+        obj = FileStorage.__objects.get(key)
+        if obj is not None:
+            texts = tuple(getattr(obj, f, "") for f in cls._text_fields)
+        else:
+            o = FileStorage.__raw[key]
+            texts = tuple(o.get(f, "") for f in cls._text_fields)
+        FileStorage.__text.update(key, tuple(t for t in texts
+                                             if isinstance(t, str)))
+
+    def __unindex(self, key):
+        """Remove key from the class, foreign key, range, grid and text
+        indexes."""
+        name, id = key.split(".", 1)
+        keys = FileStorage.__classes.get(name)
+        if keys is not None:
+            keys.pop(key, None)
+        self.__unindex_parents(key)
+        for index in FileStorage.__ranges.get(name, {}).values():
+            index.discard(id)
+        if name in FileStorage.__grids:
+            FileStorage.__grids[name].discard(id)
+        if FileStorage.__text is not None:
+            FileStorage.__text.discard(key)
+
+    def __unindex_parents(self, key):
+        """Remove key from the foreign key index."""
+        refs = FileStorage.__parents.pop(key, None)
+        if refs is None:
+            return
+        name = key.split(".", 1)[0]
+        for attr, ref in zip(model_classes[name]._foreign_keys, refs):
+            index = FileStorage.__children.get((name, attr))
+            if index is None:
+                continue
+            for ref_id in self.__ref_ids(ref):
+                keys = index.get(ref_id)
+                if keys is not None:
+                    keys.pop(key, None)
+                    if not keys:
+                        del index[ref_id]
+
+    def get(self, cls, id):
+        """Return the stored object of a class with the given id.
+
+        Args:
+            cls (type or str): The class of the object, or its name.
+            id (str): The id of the object.
+        Returns:
+            The object, or None if it is not stored.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        key = "{}.{}".format(name, id)
+        obj = FileStorage.__objects.get(key)
+        if obj is None and key in FileStorage.__raw:
+            with FileStorage.__lock:
+                obj = self.__materialize(key)
+        return obj
+
+    def __materialize(self, key):
+        """Instantiate the raw object stored under key, in lazy mode."""
+        # Index the keys in their load order before key moves to the
+        # end of __objects.
+        self.__refresh_indexes()
+        o = FileStorage.__raw.pop(key, None)
+        if o is None:
+            return FileStorage.__objects.get(key)
+        return self.__hydrate(key, o)
+
     def new(self, obj):
         """Set in __objects obj with key <obj_class_name>.id"""
         ocname = obj.__class__.__name__
-        FileStorage.__objects["{}.{}".format(ocname, obj.id)] = obj
+        key = "{}.{}".format(ocname, obj.id)
+        with FileStorage.__lock:
+            FileStorage.__objects[key] = obj
+            FileStorage.__raw.pop(key, None)
+            FileStorage.__pending.add(key)
+            self.__index(key)
+
+    def touch(self, obj):
+        """Mark obj as changed since the last save, if it is stored."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with FileStorage.__lock:
+            if key in FileStorage.__objects:
+                FileStorage.__pending.add(key)
+                self.__index_parents(key)
+                self.__index_ranges(key)
+                self.__index_grid(key)
+                self.__index_text(key)
+
+    def delete(self, obj):
+        """Remove obj from __objects, if it is stored."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with FileStorage.__lock:
+            if (FileStorage.__objects.pop(key, None) is not None or
+                    FileStorage.__raw.pop(key, None) is not None):
+                FileStorage.__pending.add(key)
+                self.__unindex(key)
 
     def save(self):
-        """Serialize __objects to the JSON file __file_path."""
+        """Serialize __objects to the JSON file __file_path.
+
+        With write-behind enabled this only schedules a flush() on the
+        background thread; call close() before exiting.
+        """
+        if FileStorage.__write_behind <= 0:
+            self.flush()
+            return
+        with FileStorage.__lock:
+            if FileStorage.__flusher is None:
+                FileStorage.__flusher = Flusher(self,
+                                                FileStorage.__write_behind)
+                FileStorage.__flusher.start()
+            FileStorage.__flusher.request()
+
+    def close(self):
+        """Stop the write-behind thread and write what it still holds."""
+        with FileStorage.__lock:
+            flusher = FileStorage.__flusher
+            FileStorage.__flusher = None
+        if flusher is not None:
+            flusher.stop()
+            self.flush()
+
+    def flush(self):
+        """Write the changes made since the last flush to disk now.
+
+        In journal mode only the objects changed since the last save
+        are appended to __log_path. In sharded mode only the files of
+        the classes with changed objects are rewritten.
+        """
+        with FileStorage.__lock:
+            if FileStorage.__journal:
+                self.__append_log()
+            else:
+                if FileStorage.__sharded:
+                    self.__load_missing_shards()
+                self.__refresh_fragments()
+                if FileStorage.__sharded:
+                    self.__save_shards()
+                else:
+                    self.__dump(FileStorage.__file_path,
+                                ((key, self.__fragment(key))
+                                 for key in self.__keys()))
+                # The snapshot now holds every change the journal recorded.
+                for path in (FileStorage.__log_path + ".1",
+                             FileStorage.__log_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                FileStorage.__log_records = 0
+                FileStorage.__log_keys = set()
+            FileStorage.__pending.clear()
+
+    def __load_missing_shards(self):
+        """Load the class files that a partial reload skipped but that
+        are about to be rewritten, keeping the objects in memory."""
+        if FileStorage.__loaded is None:
+            return
+        for key in list(FileStorage.__pending):
+            name = key.split(".", 1)[0]
+            if name not in FileStorage.__loaded:
+                FileStorage.__loaded.add(name)
+                path = self.__shard_path(name)
+                if os.path.exists(path):
+                    self.__load(path, None, replace=False)
+                else:
+                    self.__load(FileStorage.__file_path, {name},
+                                replace=False)
+
+    def __save_shards(self):
+        """Rewrite the class files holding pending keys.
+
+        A single __file_path left from unsharded use is split into class
+        files and removed, provided every class was loaded; otherwise
+        the classes whose files were written are no longer read from it.
+        """
+        names = {key.split(".", 1)[0] for key in FileStorage.__pending}
+        migrate = (FileStorage.__loaded is None and
+                   os.path.exists(FileStorage.__file_path))
+        if migrate:
+            names.update(key.split(".", 1)[0] for key in self.__keys())
+        for name in names:
+            prefix = name + "."
+            self.__dump(self.__shard_path(name),
+                        ((key, self.__fragment(key))
+                         for key in self.__keys()
+                         if key.startswith(prefix)))
+        if migrate:
+            os.remove(FileStorage.__file_path)
+
+    def __keys(self):
+        """Return an iterator over the keys of every stored object."""
+        return chain(FileStorage.__objects, FileStorage.__raw)
+
+    def __shard_path(self, name):
+        """Return the path of the file holding the objects of class name."""
+        return os.path.join(os.path.dirname(FileStorage.__file_path),
+                            name + ".json")
+
+    def __dump(self, path, pairs):
+        """Write (key, JSON fragment) pairs to path as one JSON object.
+
+        pairs is consumed lazily, so entries are serialized and written
+        one at a time. The data goes to a temporary file in the same
+        directory that is then renamed over path, so a crash leaves
+        either the old or the new file, never a truncated one.
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            dump_fragments(pairs, f)
+            self.__sync(f)
+        os.replace(tmp_path, path)
+        if FileStorage.__durability == "fsync":
+            self.__sync_dir(path)
+
+    def __sync(self, f):
+        """Flush f to the disk unless durability is "none"."""
+        if FileStorage.__durability != "none":
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __sync_dir(self, path):
+        """Flush the directory entry of path to the disk."""
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def __refresh_fragments(self):
+        """Drop the cached fragments of pending and vanished keys."""
         odict = FileStorage.__objects
-        objdict = {obj: odict[obj].to_dict() for obj in odict.keys()}
-        with open(FileStorage.__file_path, "w") as f:
-            json.dump(objdict, f)
+        raw = FileStorage.__raw
+        frags = FileStorage.__fragments
+        for key in FileStorage.__pending:
+            frags.pop(key, None)
+        if len(frags) > len(odict) + len(raw):
+            for key in frags.keys() - odict.keys() - raw.keys():
+                del frags[key]
+
+    def __fragment(self, key):
+        """Return the JSON text of the object stored under key.
+
+        Only objects changed since they were last serialized go through
+        to_dict() again.
+        """
+        frag = FileStorage.__fragments.get(key)
+        if frag is None:
+            obj = FileStorage.__objects.get(key)
+            if obj is None:
+                frag = json.dumps(FileStorage.__raw[key])
+            else:
+                frag = json.dumps(obj.to_dict())
+            FileStorage.__fragments[key] = frag
+        return frag
+
+    def __append_log(self):
+        """Append one journal record per pending key to __log_path."""
+        self.__refresh_fragments()
+        created = not os.path.exists(FileStorage.__log_path)
+        with open(FileStorage.__log_path, "a") as f:
+            for key in FileStorage.__pending:
+                if key in FileStorage.__objects or key in FileStorage.__raw:
+                    rec = '{{"op": "put", "key": {}, "obj": {}}}'.format(
+                        json.dumps(key), self.__fragment(key))
+                else:
+                    rec = '{{"op": "delete", "key": {}}}'.format(
+                        json.dumps(key))
+                f.write(rec + "\n")
+            self.__sync(f)
+        if created and FileStorage.__durability == "fsync":
+            self.__sync_dir(FileStorage.__log_path)
+        FileStorage.__log_records += len(FileStorage.__pending)
+        FileStorage.__log_keys |= FileStorage.__pending
+
+    def columns(self):
+        """Return a ColumnStore snapshot of the stored objects.
+
+        In lazy mode, objects that were not instantiated yet are added
+        from their raw dictionaries and stay uninstantiated.
+        """
+        store = ColumnStore()
+        with FileStorage.__lock:
+            for obj in FileStorage.__objects.values():
+                store.add(obj.to_dict())
+            for o in FileStorage.__raw.values():
+                store.add(o)
+        return store
+
+    def needs_compaction(self):
+        """Return True if the journal is big or dead enough to compact.
+
+        A record is dead once a later record supersedes it or its object
+        is deleted.
+        """
+        try:
+            size = os.path.getsize(FileStorage.__log_path)
+        except OSError:
+            return False
+        if size >= FileStorage.__compact_bytes:
+            return True
+        records = FileStorage.__log_records
+        if records == 0:
+            return False
+        live = sum(1 for k in FileStorage.__log_keys
+                   if k in FileStorage.__objects or k in FileStorage.__raw)
+        return (records - live) / records >= FileStorage.__compact_ratio
+
+    def compact(self):
+        """Rewrite __file_path as a snapshot and start a fresh journal.
+
+        The journal is rotated to a segment under the lock, so concurrent
+        new() and save() calls only wait for a rename; the snapshot is
+        then written to a temporary file and renamed over __file_path.
+        reload() replays a leftover segment if a compaction is cut short.
+        Returns False if another compaction is already running.
+        """
+        if not FileStorage.__journal:
+            self.flush()
+            return True
+        if not FileStorage.__compacting.acquire(blocking=False):
+            return False
+        try:
+            segment = FileStorage.__log_path + ".1"
+            with FileStorage.__lock:
+                if os.path.exists(FileStorage.__log_path):
+                    if os.path.exists(segment):
+                        with open(FileStorage.__log_path) as src, \
+                                open(segment, "a") as dst:
+                            dst.write(src.read())
+                        os.remove(FileStorage.__log_path)
+                    else:
+                        os.rename(FileStorage.__log_path, segment)
+                items = list(FileStorage.__objects.items())
+                items += FileStorage.__raw.items()
+                FileStorage.__log_records = 0
+                FileStorage.__log_keys = set()
+            if FileStorage.__sharded:
+                names = set(model_classes)
+                names.update(key.split(".", 1)[0] for key, _ in items)
+                paths = {name + ".": self.__shard_path(name)
+                         for name in names}
+            else:
+                paths = {"": FileStorage.__file_path}
+            for prefix, path in paths.items():
+                self.__dump(path,
+                            ((key, json.dumps(obj if isinstance(obj, dict)
+                                              else obj.to_dict()))
+                             for key, obj in items
+                             if key.startswith(prefix)))
+            if FileStorage.__sharded and os.path.exists(
+                    FileStorage.__file_path):
+                os.remove(FileStorage.__file_path)
+            if os.path.exists(segment):
+                os.remove(segment)
+            return True
+        finally:
+            FileStorage.__compacting.release()
+
+    def reload(self, *, classes=None):
+        """Deserialize the JSON file __file_path to __objects, if it exists.
+
+        Any journal records in __log_path are replayed on top of it.
+        In lazy mode the objects are only instantiated when first read
+        through all() or get().
+
+        Args:
+            classes (iterable): In sharded mode, the classes (or class
+                names) to load. Every class is loaded if None, or if a
+                journal is in use.
+        """
+        FileStorage.__fragments = {}
+        names = None
+        if (FileStorage.__sharded and classes is not None and
+                not FileStorage.__journal and
+                not os.path.exists(FileStorage.__log_path) and
+                not os.path.exists(FileStorage.__log_path + ".1")):
+            names = {c if isinstance(c, str) else c.__name__
+                     for c in classes}
+        if FileStorage.__sharded:
+            # A class file replaces the objects of its class that are
+            # still in a __file_path left from unsharded use.
+            shards = [name for name in names or list(model_classes)
+                      if os.path.exists(self.__shard_path(name))]
+            self.__load(FileStorage.__file_path, names, exclude=set(shards))
+            for name in shards:
+                self.__load(self.__shard_path(name), None)
+        else:
+            self.__load(FileStorage.__file_path, names)
+        FileStorage.__loaded = names
+        FileStorage.__log_records = 0
+        FileStorage.__log_keys = set()
+        self.__replay_log(FileStorage.__log_path + ".1")
+        self.__replay_log(FileStorage.__log_path)
+        # Replayed changes are not in the class files yet.
+        if FileStorage.__journal:
+            FileStorage.__pending.clear()
+        else:
+            FileStorage.__pending = set(FileStorage.__log_keys)
+
+    def __load(self, path, names, replace=True, exclude=()):
+        """Add the objects of the JSON file at path to __objects.
+
+        Args:
+            path (str): The file to read; missing files are skipped.
+            names (set): The class names to load, or None for all.
+            exclude (iterable): Class names not to load.
+            replace (bool): Whether loaded objects replace stored objects
+                with the same key.
+        """
+        try:
+            f = open(path)
+        except FileNotFoundError:
+            return
+        with f:
+            # Entries are decoded and stored one at a time, so the whole
+            # document never sits in memory next to the objects.
+            for key, o in iterload(f):
+                if ((names is not None and o["__class__"] not in names) or
+                        o["__class__"] in exclude):
+                    continue
+                if replace or (key not in FileStorage.__objects and
+                               key not in FileStorage.__raw):
+                    self.__put(key, o)
+
+    def __put(self, key, o):
+        """Store the object described by dictionary o under key."""
+        if FileStorage.__lazy:
+            cls = model_classes.get(o["__class__"])
+            if cls is not None:
+                intern_keys(cls, o)
+            FileStorage.__objects.pop(key, None)
+            FileStorage.__raw[key] = o
+            self.__index(key)
+        else:
+            self.__hydrate(key, o)
+
+    def __hydrate(self, key, o):
+        """Instantiate the object described by dictionary o and store it
+        under key."""
+        obj = model_classes[o["__class__"]].from_dict(o)
+        FileStorage.__objects[key] = obj
+        FileStorage.__raw.pop(key, None)
+        self.__index(key)
+        return obj
 
-    def reload(self):
-        """Deserialize the JSON file __file_path to __objects, if it exists."""
+    def __replay_log(self, path):
+        """Apply the records of the journal at path to __objects, in order."""
+        good = 0
         try:
-            with open(FileStorage.__file_path) as f:
-                objdict = json.load(f)
-                for o in objdict.values():
-                    cls_name = o["__class__"]
-                    del o["__class__"]
-                    self.new(eval(cls_name)(**o))
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        rec = None
+                    if rec is None or not line.endswith(b"\n"):
+                        # A crash mid-append leaves a truncated last line;
+                        # cut it off so later appends start on a fresh one.
+                        os.truncate(path, good)
+                        break
+                    good += len(line)
+                    FileStorage.__log_records += 1
+                    FileStorage.__log_keys.add(rec["key"])
+                    if rec["op"] == "delete":
+                        FileStorage.__objects.pop(rec["key"], None)
+                        FileStorage.__raw.pop(rec["key"], None)
+                        self.__unindex(rec["key"])
+                    else:
+                        self.__put(rec["key"], rec["obj"])
         except FileNotFoundError:
             return
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Defines the Flusher class."""
+import threading
+
+
+class Flusher(threading.Thread):
+    """Represent a background thread that writes a storage behind saves.
+
+    Saves only request a flush; the thread performs at most one flush
+    per interval, so a burst of saves costs a single write.
+
+    Attributes:
+        storage (FileStorage): The storage engine to flush.
+        interval (float): Minimum number of seconds between two flushes.
+    """
+
+    def __init__(self, storage, interval):
+        """Initialize a new Flusher.
+
+        Args:
+            storage (FileStorage): The storage engine to flush.
+            interval (float): Minimum number of seconds between two
+                flushes.
+        """
+        super().__init__(name="hbnb-flusher", daemon=True)
+        self.storage = storage
+        self.interval = interval
+        self.__requested = threading.Event()
+        self.__stopped = threading.Event()
+
+    def request(self):
+        """Ask for the storage to be flushed."""
+        self.__requested.set()
+
+    def run(self):
+        """Flush the storage whenever a flush was requested."""
+        while True:
+            self.__requested.wait()
+            if self.__stopped.is_set():
+                return
+            self.__requested.clear()
+            self.storage.flush()
+            self.__stopped.wait(self.interval)
+
+    def stop(self):
+        """Stop flushing and wait for the thread to finish.
+
+        Requests not flushed yet are left to the caller.
+        """
+        self.__stopped.set()
+        self.__requested.set()
+        self.join()
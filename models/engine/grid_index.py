@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+"""Defines the GridIndex class."""
+import heapq
+from math import asin, cos, degrees, radians, sin, sqrt
+
+EARTH_RADIUS = 6371.0088
+"""float: The mean radius of the Earth, in kilometers."""
+
+KM_PER_DEGREE = radians(1) * EARTH_RADIUS
+"""float: The length of one degree of latitude, in kilometers."""
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """Return the great-circle distance between two points, in km."""
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    h = (sin((lat2 - lat1) / 2) ** 2 +
+         cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(h)))
+
+
+class GridIndex:
+    """Represent ids of points bucketed into a latitude/longitude grid.
+
+    Queries only visit the cells around the searched point, so their
+    cost depends on the number of points nearby rather than on the
+    total number of points.
+
+    Attributes:
+        size (float): The side of a cell, in degrees.
+    """
+
+    def __init__(self, size=0.5):
+        """Initialize a new GridIndex.
+
+        Args:
+            size (float): The side of a cell, in degrees; it must divide
+                180, so the cells tile the globe exactly.
+        Raises:
+            ValueError: If size does not divide 180.
+        """
+        rows = round(180 / size) if size > 0 else 0
+        if rows < 1 or abs(rows * size - 180) > 1e-9:
+            raise ValueError("cell size must divide 180 degrees: {}"
+                             .format(size))
+        self.size = 180 / rows
+        self.__rows = rows
+        self.__cols = 2 * rows
+        self.__cells = {}
+        self.__points = {}
+
+    def __len__(self):
+        """Return the number of indexed ids."""
+        return len(self.__points)
+
+    def __cell(self, lat, lon):
+        """Return the (row, column) of the cell holding a point.
+
+        The poles fall in the first and last rows, and longitude 180 in
+        the first column, along with -180.
+        """
+        return (min(int((lat + 90) // self.size), self.__rows - 1),
+                int((lon + 180) // self.size) % self.__cols)
+
+    def update(self, id, lat, lon):
+        """Index id at a point, replacing its previous point.
+
+        Ids with a latitude or longitude that is not a number in range
+        are not indexed.
+
+        Args:
+            id (str): The id of an object.
+            lat (float): Its latitude, in degrees.
+            lon (float): Its longitude, in degrees.
+        """
+        point = self.__points.get(id)
+        if point is not None:
+            if point == (lat, lon):
+                return
+            self.discard(id)
+        if (type(lat) not in (int, float) or type(lon) not in (int, float)
+                or not -90 <= lat <= 90 or not -180 <= lon <= 180):
+            return
+        self.__cells.setdefault(self.__cell(lat, lon), {})[id] = (lat, lon)
+        self.__points[id] = (lat, lon)
+
+    def discard(self, id):
+        """Remove id from the index, if it is indexed."""
+        point = self.__points.pop(id, None)
+        if point is None:
+            return
+        cell = self.__cell(*point)
+        ids = self.__cells[cell]
+        del ids[id]
+        if not ids:
+            del self.__cells[cell]
+
+    def __ring(self, row, col, r):
+        """Yield the cells at Chebyshev distance r from (row, col)."""
+        for dr in range(-r, r + 1):
+            y = row + dr
+            if not 0 <= y < self.__rows:
+                continue
+            step = 1 if abs(dr) == r else 2 * r
+            for dc in range(-r, r + 1, step):
+                yield (y, (col + dc) % self.__cols)
+
+    def __reach(self, lat, lon, r):
+        """Return a distance, in km, within which every point is in the
+        cells at most r rings away from the cell of a point."""
+        row, col = self.__cell(lat, lon)
+        south = -90 + (row - r) * self.size
+        north = -90 + (row + r + 1) * self.size
+        reach = min(lat - south if south > -90 else 180,
+                    north - lat if north < 90 else 180) * KM_PER_DEGREE
+        if 2 * r + 1 < self.__cols:
+            west = -180 + (col - r) * self.size
+            east = -180 + (col + r + 1) * self.size
+            gap = min(lon - west, east - lon, 90)
+            # The distance from the point to the nearest meridian of
+            # the first longitude left out.
+            reach = min(reach, EARTH_RADIUS * asin(
+                cos(radians(lat)) * sin(radians(gap))))
+        return reach
+
+    def within(self, lat, lon, km):
+        """Return the ids of the points within km of a point.
+
+        Only the cells of the bounding box of the circle are visited.
+
+        Args:
+            lat (float): The latitude of the point, in degrees.
+            lon (float): The longitude of the point, in degrees.
+            km (float): The radius, in kilometers.
+        Returns:
+            A list of (distance, id) pairs, nearest first.
+        """
+        dlat = km / KM_PER_DEGREE
+        row_lo = self.__cell(max(-90, lat - dlat), lon)[0]
+        row_hi = self.__cell(min(90, lat + dlat), lon)[0]
+        if (lat - dlat <= -90 or lat + dlat >= 90 or
+                sin(radians(dlat)) >= cos(radians(lat))):
+            # The circle holds a pole: every longitude is in reach.
+            cols = range(self.__cols)
+        else:
+            dlon = degrees(asin(sin(radians(dlat)) / cos(radians(lat))))
+            col_lo = int((lon - dlon + 180) // self.size)
+            col_hi = int((lon + dlon + 180) // self.size)
+            if col_hi - col_lo + 1 >= self.__cols:
+                cols = range(self.__cols)
+            else:
+                cols = [c % self.__cols for c in range(col_lo, col_hi + 1)]
+        found = []
+        for y in range(row_lo, row_hi + 1):
+            for x in cols:
+                for id, (plat, plon) in self.__cells.get((y, x),
+                                                         {}).items():
+                    d = distance(lat, lon, plat, plon)
+                    if d <= km:
+                        found.append((d, id))
+        found.sort()
+        return found
+
+    def nearest(self, lat, lon, k):
+        """Return the ids of the k points nearest to a point.
+
+        Rings of cells are searched outwards from the cell of the point
+        until the k nearest points found are closer than any cell left.
+
+        Args:
+            lat (float): The latitude of the point, in degrees.
+            lon (float): The longitude of the point, in degrees.
+            k (int): The number of ids to return.
+        Returns:
+            A list of (distance, id) pairs, nearest first.
+        """
+        if k <= 0:
+            return []
+        if k >= len(self.__points):
+            return sorted((distance(lat, lon, *p), id)
+                          for id, p in self.__points.items())
+        row, col = self.__cell(lat, lon)
+        best = []
+        seen = set()
+        r = 0
+        while True:
+            found = []
+            for cell in self.__ring(row, col, r):
+                if cell in seen:
+                    continue
+                seen.add(cell)
+                for id, (plat, plon) in self.__cells.get(cell, {}).items():
+                    found.append((distance(lat, lon, plat, plon), id))
+            if found:
+                # Ties are broken by id, as sorting every point would.
+                best = heapq.nsmallest(k, best + found)
+            covered = r >= self.__rows and 2 * r + 1 >= self.__cols
+            # The margin keeps searching while a point left out could
+            # tie with the last one found, up to rounding.
+            if covered or (len(best) == k and best[-1][0] + 1e-6 <
+                           self.__reach(lat, lon, r)):
+                break
+            r += 1
+        return best
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""Defines helpers to read and write JSON objects one entry at a time."""
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def iterload(f, chunk_size=1 << 16):
+    """Yield the (key, value) pairs of the JSON object stored in f.
+
+    The file is read in chunks and each value is decoded as soon as it
+    is complete, so only one entry is held in memory at a time.
+
+    Args:
+        f (file): A text file holding a single JSON object.
+        chunk_size (int): The number of characters read at a time.
+    Raises:
+        json.JSONDecodeError: If f does not hold a JSON object.
+    """
+    buf = ""
+    pos = 0
+    eof = False
+
+    def more():
+        """Drop the consumed text and read the next chunk into buf."""
+        nonlocal buf, pos, eof
+        chunk = f.read(max(chunk_size, len(buf) - pos))
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def peek():
+        """Skip whitespace and return the next character, or ''."""
+        nonlocal pos
+        while True:
+            pos = _whitespace.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            more()
+
+    def decode():
+        """Decode the JSON value starting at pos."""
+        nonlocal pos
+        while True:
+            try:
+                val, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more()
+                continue
+            # A number may go on in the next chunk.
+            if end == len(buf) and not eof:
+                more()
+                continue
+            pos = end
+            return val
+
+    if peek() != "{":
+        raise json.JSONDecodeError("Expecting '{'", buf, pos)
+    pos += 1
+    if peek() == "}":
+        return
+    while True:
+        if peek() != '"':
+            raise json.JSONDecodeError("Expecting property name", buf, pos)
+        key = decode()
+        if peek() != ":":
+            raise json.JSONDecodeError("Expecting ':' delimiter", buf, pos)
+        pos += 1
+        peek()
+        yield key, decode()
+        c = peek()
+        pos += 1
+        if c == "}":
+            return
+        if c != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+
+
+def dump_fragments(pairs, f, chunk_size=1 << 16):
+    """Write (key, JSON text) pairs to f as a single JSON object.
+
+    Entries are consumed from pairs as they are written, in chunks of
+    about chunk_size characters, so the document is never built whole.
+
+    Args:
+        pairs (iterable): (str, str) pairs of a key and the serialized
+            JSON value to store under it.
+        f (file): A text file open for writing.
+        chunk_size (int): The number of characters written at a time.
+    """
+    chunk = ["{"]
+    size = 1
+    sep = ""
+    for key, text in pairs:
+        piece = "{}{}: {}".format(sep, json.dumps(key), text)
+        sep = ", "
+        chunk.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            f.write("".join(chunk))
+            chunk = []
+            size = 0
+    chunk.append("}")
+    f.write("".join(chunk))
@@ -0,0 +1,273 @@
+#!/usr/bin/python3
+"""Defines the Query class."""
+import operator
+from models.base_model import classes as model_classes
+
+
+def _contains(value, item):
+    """Return True if the list or str value holds item."""
+    return isinstance(value, (list, str)) and item in value
+
+
+def _in(value, items):
+    """Return True if value is one of items."""
+    return value in items
+
+
+def _sort_key(value, desc=False):
+    """Return a key sorting value without comparing unrelated types.
+
+    Numbers come first, then strs, then other values by type name and
+    repr(); None, like a missing attribute, always comes last, also
+    when the key is used with reverse=True for a descending order.
+    """
+    if value is None:
+        return (-1,) if desc else (3,)
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return (2, type(value).__name__, repr(value))
+
+
+class Query:
+    """Represent a query over the stored objects of one class.
+
+    Conditions are given as keyword arguments: name=value for equality,
+    or name__<op>=value where <op> is one of lt, lte, gt, gte, ne, in
+    or contains. Before running, the planner looks at each condition an
+    index can answer (an equality on a foreign key or contains on a list
+    of them, through lookup(), or bounds on a declared int or float
+    attribute, through ids_in_range()) and starts from the one with the
+    fewest candidates; without one it scans the class through keys(cls).
+    A range index is also chosen when it already yields the order_by()
+    order, which saves the sort. Every condition is then checked on
+    each candidate, as it is read.
+
+    Attributes:
+        cls (type): The class of the objects.
+    """
+
+    __ops = {"eq": operator.eq, "ne": operator.ne, "lt": operator.lt,
+             "lte": operator.le, "gt": operator.gt, "gte": operator.ge,
+             "in": _in, "contains": _contains}
+    __signs = {"eq": "==", "ne": "!=", "lt": "<", "lte": "<=", "gt": ">",
+               "gte": ">=", "in": "in", "contains": "contains"}
+
+    def __init__(self, storage, cls, indexed=True):
+        """Initialize a new Query.
+
+        Args:
+            storage (FileStorage or DBStorage): The storage to query.
+            cls (type or str): The class of the objects, or its name.
+            indexed (bool): Whether storage has the lookup() and
+                ids_in_range() indexes; if not, the class is scanned.
+        """
+        self.cls = cls if not isinstance(cls, str) else model_classes[cls]
+        self.__storage = storage
+        self.__indexed = indexed
+        self.__conditions = []
+        self.__order = []
+        self.__limit = None
+        self.__offset = 0
+
+    def where(self, **conditions):
+        """Add conditions every returned object must meet.
+
+        Returns:
+            The query, so calls can be chained.
+        Raises:
+            ValueError: If a condition uses an unknown operator.
+        """
+        for name, value in conditions.items():
+            attr, _, op = name.partition("__")
+            op = op or "eq"
+            if op not in Query.__ops:
+                raise ValueError("unknown operator: {}".format(op))
+            self.__conditions.append((attr, op, value))
+        return self
+
+    def order_by(self, *attrs):
+        """Sort the objects by attributes; prefix a name with - to sort
+        it in descending order.
+
+        Returns:
+            The query, so calls can be chained.
+        """
+        self.__order.extend((a.lstrip("-"), a.startswith("-"))
+                            for a in attrs)
+        return self
+
+    def limit(self, n):
+        """Return at most n objects.
+
+        Returns:
+            The query, so calls can be chained.
+        """
+        self.__limit = n
+        return self
+
+    def offset(self, n):
+        """Skip the first n objects.
+
+        Returns:
+            The query, so calls can be chained.
+        """
+        self.__offset = n
+        return self
+
+    def __iter__(self):
+        """Iterate over the matching objects, reading them as needed."""
+        source, ids, _ = self.__plan()
+        skip = self.__offset
+        left = self.__limit
+        if ids is None:
+            if not self.__conditions and not self.__order:
+                # Page through the keys, so only the objects returned
+                # are read.
+                keys = self.__storage.keys(self.cls, offset=skip,
+                                           limit=left)
+                skip, left = 0, None
+            else:
+                keys = self.__storage.keys(self.cls)
+            ids = (key.split(".", 1)[1] for key in keys)
+        objs = (self.__storage.get(self.cls, id) for id in ids)
+        objs = (obj for obj in objs
+                if obj is not None and self.__match(obj))
+        if self.__order and not self.__presorted(source):
+            objs = iter(self.__sort(list(objs)))
+        for obj in objs:
+            if left is not None and left <= 0:
+                return
+            if skip > 0:
+                skip -= 1
+                continue
+            if left is not None:
+                left -= 1
+            yield obj
+
+    def all(self):
+        """Return the list of the matching objects."""
+        return list(self)
+
+    def first(self):
+        """Return the first matching object, or None."""
+        return next(iter(self), None)
+
+    def count(self):
+        """Return the number of matching objects."""
+        return sum(1 for _ in self)
+
+    def explain(self):
+        """Return a description of how the query would run."""
+        source, ids, count = self.__plan()
+        lines = ["Query({})".format(self.cls.__name__)]
+        if source is None:
+            lines.append("  scan: class index ({} objects)".format(count))
+        else:
+            kind, attr = source
+            bounds = " and ".join(self.__describe(c) for c in
+                                  self.__conditions if c[0] == attr)
+            bounds = bounds or "all {}".format(attr)
+            lines.append("  {}: {} ({} candidates)".format(kind, bounds,
+                                                           count))
+        for c in self.__conditions:
+            lines.append("  filter: {}".format(self.__describe(c)))
+        if self.__order:
+            lines.append("  order by: {}{}".format(
+                ", ".join(("-" if desc else "") + a
+                          for a, desc in self.__order),
+                " (index order)" if self.__presorted(source) else ""))
+        if self.__offset:
+            lines.append("  offset: {}".format(self.__offset))
+        if self.__limit is not None:
+            lines.append("  limit: {}".format(self.__limit))
+        return "\n".join(lines)
+
+    def __describe(self, condition):
+        """Return the text of a condition."""
+        attr, op, value = condition
+        return "{} {} {!r}".format(attr, Query.__signs[op], value)
+
+    def __plan(self):
+        """Choose where the candidates come from.
+
+        Returns:
+            A (source, ids, count) tuple: source is None for a class
+            scan, or a (kind, attribute) pair naming the index used; ids
+            are the ids of the candidates, or None for a class scan.
+        """
+        total = self.__storage.count(self.cls)
+        best = (None, None, total)
+        if not self.__indexed:
+            return best
+        for attr, op, value in self.__conditions:
+            if attr not in self.cls._foreign_keys:
+                continue
+            many = type(self.cls._defaults.get(attr)) is list
+            if (op == ("contains" if many else "eq") and
+                    isinstance(value, str)):
+                ids = self.__storage.lookup(self.cls, attr, value)
+                if len(ids) < best[2]:
+                    best = (("foreign key index", attr), ids, len(ids))
+        order = self.__order[0] if len(self.__order) == 1 else None
+        attrs = {c[0] for c in self.__conditions}
+        if order is not None:
+            attrs.add(order[0])
+        for attr in sorted(attrs):
+            bounds = self.__bounds(attr)
+            if bounds is None or (bounds == (None, None) and
+                                  (order is None or attr != order[0])):
+                continue
+            ids = self.__storage.ids_in_range(
+                self.cls, attr, *bounds, reverse=(order == (attr, True)))
+            # An index also saves the sort when it yields the order
+            # asked for, but only if it holds every candidate: without
+            # bounds, objects whose value is not a number are left out.
+            if bounds == (None, None) and len(ids) != total:
+                continue
+            if len(ids) < best[2] or (len(ids) == best[2] and
+                                      order is not None and
+                                      attr == order[0]):
+                best = (("range index", attr), ids, len(ids))
+        return best
+
+    def __bounds(self, attr):
+        """Return the (low, high) bounds the conditions set on a declared
+        numeric attribute, or None if a range index cannot help."""
+        if type(self.cls._defaults.get(attr)) not in (int, float):
+            return None
+        low = high = None
+        for a, op, value in self.__conditions:
+            if a != attr or type(value) not in (int, float):
+                continue
+            if op in ("eq", "gt", "gte"):
+                low = value if low is None else max(low, value)
+            if op in ("eq", "lt", "lte"):
+                high = value if high is None else min(high, value)
+        return (low, high)
+
+    def __presorted(self, source):
+        """Return True if the candidates of source are already in the
+        requested order."""
+        return (source is not None and source[0] == "range index" and
+                len(self.__order) == 1 and self.__order[0][0] == source[1])
+
+    def __match(self, obj):
+        """Return True if obj meets every condition."""
+        for attr, op, value in self.__conditions:
+            try:
+                if not Query.__ops[op](getattr(obj, attr, None), value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+    def __sort(self, objs):
+        """Sort objs in place by the order_by() attributes and return
+        them; objects without an attribute, or holding None, come last."""
+        for attr, desc in reversed(self.__order):
+            objs.sort(key=lambda obj: _sort_key(getattr(obj, attr, None),
+                                                desc),
+                      reverse=desc)
+        return objs
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""Defines the SortedIndex class."""
+from bisect import bisect_left, bisect_right
+
+
+class SortedIndex:
+    """Represent ids sorted by the numeric value of one attribute.
+
+    The index is two parallel lists kept sorted by (value, id) with
+    bisect, so range queries and top-N lookups only touch the entries
+    they return. Values that are not int or float are not indexed.
+    """
+
+    def __init__(self):
+        """Initialize a new SortedIndex."""
+        self.__values = []
+        self.__ids = []
+        self.__by_id = {}
+
+    def __len__(self):
+        """Return the number of indexed ids."""
+        return len(self.__ids)
+
+    def update(self, id, value):
+        """Index id under value, replacing its previous value.
+
+        Args:
+            id (str): The id of an object.
+            value (any): The value of its attribute.
+        """
+        if id in self.__by_id:
+            if self.__by_id[id] == value:
+                return
+            self.discard(id)
+        if type(value) not in (int, float) or value != value:
+            return
+        lo = bisect_left(self.__values, value)
+        hi = bisect_right(self.__values, value, lo)
+        i = bisect_left(self.__ids, id, lo, hi)
+        self.__values.insert(i, value)
+        self.__ids.insert(i, id)
+        self.__by_id[id] = value
+
+    def discard(self, id):
+        """Remove id from the index, if it is indexed."""
+        if id not in self.__by_id:
+            return
+        value = self.__by_id.pop(id)
+        lo = bisect_left(self.__values, value)
+        hi = bisect_right(self.__values, value, lo)
+        i = bisect_left(self.__ids, id, lo, hi)
+        del self.__values[i]
+        del self.__ids[i]
+
+    def ids(self, low=None, high=None, reverse=False, limit=None):
+        """Return the ids whose value is within [low, high], in order.
+
+        Args:
+            low (int or float): The smallest value, or None for no bound.
+            high (int or float): The largest value, or None for no bound.
+            reverse (bool): Whether to return the largest values first.
+            limit (int): The maximum number of ids to return.
+        """
+        lo = 0 if low is None else bisect_left(self.__values, low)
+        hi = (len(self.__values) if high is None
+              else bisect_right(self.__values, high))
+        if limit is not None:
+            if reverse:
+                lo = max(lo, hi - limit)
+            else:
+                hi = min(hi, lo + limit)
+        ids = self.__ids[lo:hi]
+        if reverse:
+            ids.reverse()
+        return ids
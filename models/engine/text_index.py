@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""Defines the TextIndex class."""
+import heapq
+import re
+from collections import Counter
+from math import log
+
+_word = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Return the lowercase words of text, in order."""
+    return _word.findall(text.lower())
+
+
+class TextIndex:
+    """Represent an inverted index of the words of documents.
+
+    Each word maps to the documents holding it and how many times; a
+    query is ranked with Okapi BM25 over the documents holding at least
+    one of its words.
+
+    Attributes:
+        __k1 (float): How quickly repeating a word stops raising a score.
+        __b (float): How much document length lowers a score.
+    """
+
+    __k1 = 1.2
+    __b = 0.75
+
+    def __init__(self):
+        """Initialize a new TextIndex."""
+        self.__postings = {}
+        self.__lengths = {}
+        self.__texts = {}
+        self.__total = 0
+
+    def __len__(self):
+        """Return the number of indexed documents."""
+        return len(self.__texts)
+
+    def update(self, doc, texts):
+        """Index the words of texts under doc, replacing its old words.
+
+        Args:
+            doc (str): The document, e.g. the key of an object.
+            texts (tuple): The strings holding its words.
+        """
+        if self.__texts.get(doc) == texts:
+            return
+        self.discard(doc)
+        words = [w for text in texts for w in tokenize(text)]
+        for word, count in Counter(words).items():
+            postings = self.__postings.get(word)
+            if postings is None:
+                postings = self.__postings[word] = {}
+            postings[doc] = count
+        self.__texts[doc] = texts
+        self.__lengths[doc] = len(words)
+        self.__total += len(words)
+
+    def discard(self, doc):
+        """Remove doc from the index, if it is indexed."""
+        texts = self.__texts.pop(doc, None)
+        if texts is None:
+            return
+        for text in texts:
+            for word in tokenize(text):
+                postings = self.__postings.get(word)
+                if postings is not None:
+                    postings.pop(doc, None)
+                    if not postings:
+                        del self.__postings[word]
+        self.__total -= self.__lengths.pop(doc)
+
+    def search(self, query, limit=None, accept=None):
+        """Return the documents matching the words of query, best first.
+
+        Args:
+            query (str): The words to look for.
+            limit (int): The maximum number of documents to return.
+            accept (callable): If given, only the documents it returns
+                True for are ranked.
+        Returns:
+            A list of (score, doc) pairs; ties are ordered by doc.
+        """
+        count = len(self.__texts)
+        if count == 0:
+            return []
+        avg = self.__total / count or 1
+        k1, b = TextIndex.__k1, TextIndex.__b
+        scores = {}
+        for word in set(tokenize(query)):
+            postings = self.__postings.get(word, {})
+            idf = log(1 + (count - len(postings) + 0.5) /
+                      (len(postings) + 0.5))
+            for doc, tf in postings.items():
+                if accept is not None and not accept(doc):
+                    continue
+                norm = k1 * (1 - b + b * self.__lengths[doc] / avg)
+                scores[doc] = (scores.get(doc, 0) +
+                               idf * tf * (k1 + 1) / (tf + norm))
+        ranked = ((score, doc) for doc, score in scores.items())
+        key = (lambda item: (-item[0], item[1]))
+        if limit is None:
+            return sorted(ranked, key=key)
+        return heapq.nsmallest(limit, ranked, key=key)
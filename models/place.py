@@ -17,9 +17,13 @@ class Place(BaseModel):
         price_by_night (int): The price by night of the place.
         latitude (float): The latitude of the place.
         longitude (float): The longitude of the place.
-        amenity_ids (list): A list of Amenity ids.
+        amenity_ids (list): A list of Amenity ids; an empty tuple until
+            set, so it cannot be changed in place.
     """
 
+    _foreign_keys = {"city_id": "City", "user_id": "User",
+                     "amenity_ids": "Amenity"}
+    _text_fields = ("name", "description")
     city_id = ""
     user_id = ""
     name = ""
@@ -31,3 +35,18 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    def add_amenity(self, amenity):
+        """Add the id of an Amenity to amenity_ids.
+
+        The list is replaced rather than appended to, so storage sees
+        the change.
+        """
+        if amenity.id not in self.amenity_ids:
+            self.amenity_ids = list(self.amenity_ids) + [amenity.id]
+
+    def remove_amenity(self, amenity):
+        """Remove the id of an Amenity from amenity_ids, if present."""
+        if amenity.id in self.amenity_ids:
+            self.amenity_ids = [i for i in self.amenity_ids
+                                if i != amenity.id]
@@ -12,6 +12,8 @@ class Review(BaseModel):
         text (str): The text of the review.
     """
 
+    _foreign_keys = {"place_id": "Place", "user_id": "User"}
+    _text_fields = ("text",)
     place_id = ""
     user_id = ""
     text = ""
@@ -10,6 +10,8 @@ Unittest classes:
     TestHBNBCommand_all
     TestHBNBCommand_destroy
     TestHBNBCommand_update
+    TestHBNBCommand_search
+    TestHBNBCommand_where
 """
 import os
 import sys
@@ -74,11 +76,21 @@ class TestHBNBCommand_help(unittest.TestCase):
         h = ("Usage: all or all <class> or <class>.all()\n        "
              "Display string representations of all instances of a given class"
              ".\n        If no class is specified, displays all instantiated "
-             "objects.")
+             "objects.\n        Append limit <n> and/or offset <n> to display "
+             "one page of them,\n        or page <n> and/or cursor <key> to "
+             "display them one per line,\n        page by page, each page "
+             "ending with the cursor of the next.")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help all"))
             self.assertEqual(h, output.getvalue().strip())
 
+    def test_help_compact(self):
+        h = ("Usage: compact\n        "
+             "Rewrite the storage snapshot and start a fresh journal.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help compact"))
+            self.assertEqual(h, output.getvalue().strip())
+
     def test_help_count(self):
         h = ("Usage: count <class> or <class>.count()\n        "
              "Retrieve the number of instances of a given class.")
@@ -86,6 +98,24 @@ class TestHBNBCommand_help(unittest.TestCase):
             self.assertFalse(HBNBCommand().onecmd("help count"))
             self.assertEqual(h, output.getvalue().strip())
 
+    def test_help_search(self):
+        h = ("Usage: search [<class>] <words> or <class>.search(<words>)\n"
+             "        Display the instances whose text matches any of the "
+             "words,\n        best match first.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help search"))
+            self.assertEqual(h, output.getvalue().strip())
+
+    def test_help_where(self):
+        h = ("Usage: where <class> <conditions> or <class>.where(<conditions>"
+             ")\n        Display the instances of a class meeting every "
+             "condition, such\n        as price_by_night<100, max_guest>=4, "
+             "found through the storage\n        indexes. Append limit <n> "
+             "and/or offset <n> to display one page.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help where"))
+            self.assertEqual(h, output.getvalue().strip())
+
     def test_help_update(self):
         h = ("Usage: update <class> <id> <attribute_name> <attribute_value> or"
              "\n       <class>.update(<id>, <attribute_name>, <attribute_value"
@@ -99,7 +129,8 @@ class TestHBNBCommand_help(unittest.TestCase):
     def test_help(self):
         h = ("Documented commands (type help <topic>):\n"
              "========================================\n"
-             "EOF  all  count  create  destroy  help  quit  show  update")
+             "EOF  compact  create   help  search  update\n"
+             "all  count    destroy  quit  show    where")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help"))
             self.assertEqual(h, output.getvalue().strip())
@@ -851,6 +882,140 @@ class TestHBNBCommand_all(unittest.TestCase):
             self.assertIn("Review", output.getvalue().strip())
             self.assertNotIn("BaseModel", output.getvalue().strip())
 
+    def test_all_limit_offset(self):
+        for _ in range(3):
+            HBNBCommand().onecmd("create City")
+        cities = [str(ct) for ct in storage.all("City").values()]
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all City limit 2 "
+                                                  "offset 1"))
+            self.assertEqual(str(cities[1:3]), output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all limit 1"))
+            self.assertEqual(str([str(next(iter(storage.all().values())))]),
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("City.all(offset {})"
+                                                  .format(len(cities))))
+            self.assertEqual("[]", output.getvalue().strip())
+
+    def test_all_limit_reads_only_page(self):
+        FileStorage._FileStorage__objects = {}
+        for _ in range(3):
+            HBNBCommand().onecmd("create Review")
+        keys = list(storage.all())
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd("all limit 1 "
+                                                      "offset 1"))
+                self.assertEqual(str([str(storage.get(
+                    *keys[1].split(".")))]), output.getvalue().strip())
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd("all Review limit 1 "
+                                                      "offset 2"))
+            self.assertEqual(1, len(FileStorage._FileStorage__raw))
+        finally:
+            storage.all()
+            FileStorage._FileStorage__lazy = False
+
+    def test_all_limit_order_ignores_reads(self):
+        FileStorage._FileStorage__objects = {}
+        for _ in range(3):
+            HBNBCommand().onecmd("create State")
+            HBNBCommand().onecmd("create City")
+        keys = list(storage.all())
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            storage.get(*keys[3].split("."))
+            pages = []
+            for line in ("all limit 1 offset 1", "show " +
+                         keys[4].replace(".", " "), "all limit 1 offset 1"):
+                with patch("sys.stdout", new=StringIO()) as output:
+                    self.assertFalse(HBNBCommand().onecmd(line))
+                pages.append(output.getvalue())
+            self.assertEqual(pages[0], pages[2])
+            self.assertIn(keys[2].split(".")[1], pages[0])
+        finally:
+            storage.all()
+            FileStorage._FileStorage__lazy = False
+
+    def test_all_matches_list_output(self):
+        HBNBCommand().onecmd("create State")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all"))
+            self.assertEqual(str([str(obj) for obj in
+                                  storage.all().values()]) + "\n",
+                             output.getvalue())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all State"))
+            self.assertEqual(str([str(obj) for obj in
+                                  storage.all("State").values()]) + "\n",
+                             output.getvalue())
+
+    def test_all_pages(self):
+        for _ in range(3):
+            HBNBCommand().onecmd("create Amenity")
+        keys = list(storage.all("Amenity"))
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all Amenity page 2"))
+            lines = output.getvalue().splitlines()
+            self.assertEqual(str(storage.all()[keys[0]]), lines[0])
+            self.assertEqual(str(storage.all()[keys[1]]), lines[1])
+            self.assertEqual("next cursor: " + keys[1], lines[2])
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "Amenity.all(page 2, cursor {})".format(keys[-2])))
+            self.assertEqual(str(storage.all()[keys[-1]]),
+                             output.getvalue().strip())
+
+    def test_all_page_reads_only_page(self):
+        FileStorage._FileStorage__objects = {}
+        for _ in range(4):
+            HBNBCommand().onecmd("create Amenity")
+        keys = list(storage.all())
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(
+                    "all page 1 cursor {}".format(keys[1])))
+                self.assertEqual("next cursor: " + keys[2],
+                                 output.getvalue().splitlines()[1])
+            self.assertEqual([keys[2]],
+                             list(FileStorage._FileStorage__objects))
+        finally:
+            storage.all()
+            FileStorage._FileStorage__lazy = False
+
+    def test_all_invalid_page(self):
+        for line in ("all page 0", "all page two", "all page 2 limit 2"):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(line))
+                self.assertEqual("** invalid page **",
+                                 output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all cursor City.x"))
+            self.assertEqual("** no instance found **",
+                             output.getvalue().strip())
+
+    def test_all_invalid_limit(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all City limit many"))
+            self.assertEqual("** invalid limit **", output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all City offset"))
+            self.assertEqual("** invalid offset **",
+                             output.getvalue().strip())
+
 
 class TestHBNBCommand_update(unittest.TestCase):
     """Unittests for testing update from the HBNB command interpreter."""
@@ -1523,6 +1688,12 @@ class TestHBNBCommand_count(unittest.TestCase):
         except IOError:
             pass
 
+    def test_count_missing_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("count"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
     def test_count_invalid_class(self):
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("MyModel.count()"))
@@ -1566,5 +1737,164 @@ class TestHBNBCommand_count(unittest.TestCase):
             self.assertEqual("1", output.getvalue().strip())
 
 
+class TestHBNBCommand_search(unittest.TestCase):
+    """Unittests for testing search from the HBNB command interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__text = None
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__text = None
+
+    def create(self, cls, **attrs):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create {}".format(cls))
+        obj = storage.get(cls, output.getvalue().strip())
+        for k, v in attrs.items():
+            setattr(obj, k, v)
+        return obj
+
+    def test_search_missing_words(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search"))
+            self.assertEqual("** search words missing **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("Place.search()"))
+            self.assertEqual("** search words missing **",
+                             output.getvalue().strip())
+
+    def test_search_ranks_matches(self):
+        loft = self.create("Place", name="Loft", description="Sunny loft")
+        self.create("Place", name="Cabin", description="Quiet cabin")
+        rv = self.create("Review", text="The loft was great")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search loft"))
+            self.assertEqual(str([str(loft), str(rv)]),
+                             output.getvalue().strip())
+
+    def test_search_by_class(self):
+        loft = self.create("Place", name="Loft")
+        self.create("Review", text="Loft")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("Place.search(loft)"))
+            self.assertEqual(str([str(loft)]), output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search Place loft"))
+            self.assertEqual(str([str(loft)]), output.getvalue().strip())
+
+    def test_search_follows_update_and_destroy(self):
+        pl = self.create("Place", name="Loft")
+        HBNBCommand().onecmd("search loft")
+        HBNBCommand().onecmd('update Place {} name "Cabin"'.format(pl.id))
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search cabin"))
+            self.assertEqual(str([str(pl)]), output.getvalue().strip())
+        HBNBCommand().onecmd("destroy Place {}".format(pl.id))
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search cabin"))
+            self.assertEqual("[]", output.getvalue().strip())
+
+
+class TestHBNBCommand_where(unittest.TestCase):
+    """Unittests for testing where from the HBNB command interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.pls = []
+        for price, guests, name in ((120, 4, "Loft"), (80, 2, "My house"),
+                                    (45, 4, "Cabin"), (95, 5, "Flat")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                HBNBCommand().onecmd("create Place")
+            pl = storage.get("Place", output.getvalue().strip())
+            pl.price_by_night = price
+            pl.max_guest = guests
+            pl.name = name
+            self.pls.append(pl)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__ranges = {}
+
+    def where(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(line))
+        return output.getvalue().strip()
+
+    def strs(self, *indices):
+        return str([str(self.pls[i]) for i in indices])
+
+    def test_where_missing_class(self):
+        self.assertEqual("** class name missing **", self.where("where"))
+
+    def test_where_invalid_class(self):
+        self.assertEqual("** class doesn't exist **",
+                         self.where("MyModel.where(price_by_night<100)"))
+
+    def test_where_invalid_condition(self):
+        self.assertEqual("** invalid condition: cheap **",
+                         self.where("where Place cheap"))
+
+    def test_where_float_for_int_attribute(self):
+        self.assertEqual(self.strs(2, 1, 3), self.where(
+            "where Place price_by_night<99.5"))
+        self.assertEqual(self.where("where Place max_guest>=4"),
+                         self.where("where Place max_guest>=4.0"))
+        self.assertEqual(3, self.where("where Place max_guest>=4.0")
+                         .count("[Place]"))
+
+    def test_where_invalid_number(self):
+        self.assertEqual("** invalid condition **",
+                         self.where("where Place price_by_night<cheap"))
+
+    def test_where_dot_notation(self):
+        self.assertEqual(self.strs(2, 3), self.where(
+            "Place.where(price_by_night<100, max_guest>=4)"))
+
+    def test_where_space_notation(self):
+        self.assertEqual(self.strs(2, 1, 3), self.where(
+            "where Place price_by_night <= 100"))
+
+    def test_where_quoted_value(self):
+        self.assertEqual(self.strs(1), self.where(
+            'where Place name="My house"'))
+        self.assertEqual(self.strs(0), self.where("where Place name==Loft"))
+
+    def test_where_list_holds_value(self):
+        self.pls[3].amenity_ids = ["wifi"]
+        self.assertEqual(self.strs(3),
+                         self.where("where Place amenity_ids=wifi"))
+
+    def test_where_limit_offset(self):
+        self.assertEqual(self.strs(1), self.where(
+            "where Place price_by_night<=100 limit 1 offset 1"))
+        self.assertEqual("[]", self.where("where Place max_guest>9"))
+
+
 if __name__ == "__main__":
     unittest.main()
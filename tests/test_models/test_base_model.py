@@ -5,13 +5,23 @@ Unittest classes:
     TestBaseModel_instantiation
     TestBaseModel_save
     TestBaseModel_to_dict
+    TestBaseModel_registry
+    TestBaseModel_datetimes
+    TestBaseModel_from_dict
+    TestBaseModel_compact
+    TestBaseModel_intern
 """
 import os
 import models
+import subprocess
+import sys
+import tempfile
 import unittest
 from datetime import datetime
 from time import sleep
-from models.base_model import BaseModel
+from unittest.mock import patch
+from models.base_model import BaseModel, classes, parse_datetime
+from models.base_model import intern_keys
 
 
 class TestBaseModel_instantiation(unittest.TestCase):
@@ -188,5 +198,289 @@ class TestBaseModel_to_dict(unittest.TestCase):
             bm.to_dict(None)
 
 
+class TestBaseModel_registry(unittest.TestCase):
+    """Unittests for testing the model class registry."""
+
+    def test_registry_holds_model_classes(self):
+        for name in ("BaseModel", "User", "State", "City", "Place",
+                     "Amenity", "Review"):
+            self.assertIn(name, classes)
+            self.assertEqual(name, classes[name].__name__)
+
+    def test_subclass_is_registered(self):
+        class MyModel(BaseModel):
+            pass
+
+        self.addCleanup(classes.pop, "MyModel")
+        self.assertIs(MyModel, classes["MyModel"])
+
+
+class TestBaseModel_datetimes(unittest.TestCase):
+    """Unittests for testing datetime parsing of the BaseModel class."""
+
+    iso = "2017-09-28T21:05:54.119427"
+
+    def tearDown(self):
+        BaseModel._BaseModel__lazy_datetimes = False
+
+    def test_parse_datetime(self):
+        self.assertEqual(datetime(2017, 9, 28, 21, 5, 54, 119427),
+                         parse_datetime(self.iso))
+
+    def test_parse_datetime_without_microseconds(self):
+        dt = datetime(2017, 9, 28, 21, 5, 54)
+        self.assertEqual(dt, parse_datetime(dt.isoformat()))
+
+    def test_parse_datetime_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_datetime("28/09/2017")
+
+    def test_lazy_datetimes_kept_as_str(self):
+        BaseModel._BaseModel__lazy_datetimes = True
+        bm = BaseModel(id="1", created_at=self.iso, updated_at=self.iso)
+        self.assertEqual(self.iso, bm.__dict__["created_at"])
+        self.assertEqual(self.iso, bm.to_dict()["created_at"])
+
+    def test_lazy_datetimes_parsed_on_access(self):
+        BaseModel._BaseModel__lazy_datetimes = True
+        bm = BaseModel(id="1", created_at=self.iso, updated_at=self.iso)
+        self.assertEqual(parse_datetime(self.iso), bm.created_at)
+        self.assertEqual(datetime, type(bm.__dict__["created_at"]))
+        self.assertEqual(str, type(bm.__dict__["updated_at"]))
+
+    def test_lazy_datetimes_str(self):
+        BaseModel._BaseModel__lazy_datetimes = True
+        bm = BaseModel(id="1", created_at=self.iso, updated_at=self.iso)
+        self.assertIn(repr(parse_datetime(self.iso)), str(bm))
+
+    def test_lazy_datetimes_with_None(self):
+        BaseModel._BaseModel__lazy_datetimes = True
+        with self.assertRaises(TypeError):
+            BaseModel(id=None, created_at=None, updated_at=None)
+
+
+class TestBaseModel_from_dict(unittest.TestCase):
+    """Unittests for testing the from_dict classmethod of BaseModel."""
+
+    def test_from_dict_round_trip(self):
+        bm = BaseModel()
+        bm.name = "Holberton"
+        rebuilt = BaseModel.from_dict(bm.to_dict())
+        self.assertEqual(BaseModel, type(rebuilt))
+        self.assertEqual(bm.__dict__, rebuilt.__dict__)
+        self.assertNotIn("__class__", rebuilt.__dict__)
+
+    def test_from_dict_does_not_store(self):
+        bm = BaseModel()
+        models.storage.delete(bm)
+        rebuilt = BaseModel.from_dict(bm.to_dict())
+        self.assertNotIn(rebuilt, models.storage.all().values())
+
+    def test_from_dict_skips_defaults(self):
+        with patch("models.base_model.uuid4") as uuid4:
+            BaseModel.from_dict({"id": "1",
+                                 "created_at": "2017-09-28T21:05:54.119427",
+                                 "updated_at": "2017-09-28T21:05:54.119427"})
+        uuid4.assert_not_called()
+
+    def test_from_dict_does_not_modify_argument(self):
+        odict = BaseModel().to_dict()
+        copy = dict(odict)
+        BaseModel.from_dict(odict)
+        self.assertEqual(copy, odict)
+
+    def test_kwargs_round_trip(self):
+        bm = BaseModel()
+        bm.name = "Holberton"
+        rebuilt = BaseModel(**bm.to_dict())
+        self.assertEqual(BaseModel, type(rebuilt))
+        self.assertEqual(bm.id, rebuilt.id)
+        self.assertEqual(bm.created_at, rebuilt.created_at)
+        self.assertEqual(bm.updated_at, rebuilt.updated_at)
+        self.assertNotIn("__class__", rebuilt.__dict__)
+
+    def test_kwargs_skip_provided_defaults(self):
+        dt_iso = datetime.today().isoformat()
+        with patch("models.base_model.uuid4") as uuid4:
+            BaseModel(id="345", created_at=dt_iso, updated_at=dt_iso)
+        uuid4.assert_not_called()
+
+    def test_kwargs_defaults_come_first(self):
+        bm = BaseModel(name="Holberton", updated_at="2017-09-28T21:05:54")
+        self.assertEqual(["id", "created_at", "updated_at", "name"],
+                         list(bm.__dict__))
+        self.assertEqual(datetime(2017, 9, 28, 21, 5, 54), bm.updated_at)
+
+    def test_kwargs_fill_missing_defaults(self):
+        bm = BaseModel(name="Holberton")
+        self.assertEqual(str, type(bm.id))
+        self.assertEqual(datetime, type(bm.created_at))
+        self.assertEqual(datetime, type(bm.updated_at))
+
+
+class TestBaseModel_compact(unittest.TestCase):
+    """Unittests for testing the compact (__slots__) mode of BaseModel.
+
+    The mode is chosen when the model classes are defined, so each test
+    runs its code in a new interpreter.
+    """
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+
+    def run_models(self, code, compact=True):
+        env = dict(os.environ, PYTHONPATH=self.root,
+                   HBNB_COMPACT_MODELS="1" if compact else "0")
+        with tempfile.TemporaryDirectory() as tmp:
+            return subprocess.run([sys.executable, "-c", code], cwd=tmp,
+                                  env=env, check=True, capture_output=True,
+                                  text=True).stdout
+
+    def test_defaults_lists_declared_attributes(self):
+        from models.place import Place
+        self.assertEqual(0, Place._defaults["price_by_night"])
+        self.assertEqual([], Place._defaults["amenity_ids"])
+        self.assertNotIn("created_at", Place._defaults)
+
+    def test_compact_instances_have_no_dict(self):
+        out = self.run_models(
+            "from models.review import Review\n"
+            "r = Review()\n"
+            "print(hasattr(r, '__dict__'), 'text' in Review.__slots__)\n"
+            "print(repr(r.text), Review._defaults['text'] == '')\n")
+        self.assertEqual("False True\n'' True\n", out)
+
+    def test_compact_output_is_identical(self):
+        code = (
+            "from models.place import Place\n"
+            "dt = '2017-09-28T21:05:54.119427'\n"
+            "pl = Place(id='1', created_at=dt, updated_at=dt)\n"
+            "pl.name = 'Loft'\n"
+            "pl.max_guest = 4\n"
+            "pl.pets = True\n"
+            "print(pl)\n"
+            "print(pl.to_dict())\n")
+        self.assertEqual(self.run_models(code, compact=False),
+                         self.run_models(code))
+
+    def test_compact_output_keeps_assignment_order(self):
+        code = (
+            "from models.place import Place\n"
+            "dt = '2017-09-28T21:05:54.119427'\n"
+            "pl = Place(id='1', created_at=dt, updated_at=dt)\n"
+            "pl.price_by_night = 80\n"
+            "pl.foo = 'bar'\n"
+            "for k, v in (('max_guest', 4), ('latitude', 1.5),\n"
+            "             ('city_id', 'c')):\n"
+            "    setattr(pl, k, v)\n"
+            "print(list(pl.to_dict()))\n"
+            "print(Place.from_dict(pl.to_dict()))\n")
+        self.assertEqual(self.run_models(code, compact=False),
+                         self.run_models(code))
+
+    def test_compact_instances_share_shapes(self):
+        out = self.run_models(
+            "from models.review import Review\n"
+            "a, b = Review(), Review()\n"
+            "a.text = b.text = 'Great'\n"
+            "print(a._shape is b._shape)\n")
+        self.assertEqual("True\n", out)
+
+    def test_compact_extra_attributes(self):
+        out = self.run_models(
+            "from models.user import User\n"
+            "us = User()\n"
+            "us.nickname = 'Betty'\n"
+            "print(us._extra, us.nickname)\n"
+            "print(hasattr(us, 'middle_name'))\n")
+        self.assertEqual("{'nickname': 'Betty'} Betty\nFalse\n", out)
+
+    def test_compact_save_reload(self):
+        out = self.run_models(
+            "import models\n"
+            "from models.place import Place\n"
+            "pl = Place()\n"
+            "pl.price_by_night = 80\n"
+            "pl.pets = True\n"
+            "pl.save()\n"
+            "models.storage.reload()\n"
+            "obj = models.storage.get(Place, pl.id)\n"
+            "print(obj is pl, obj.to_dict() == pl.to_dict())\n")
+        self.assertEqual("False True\n", out)
+
+    def test_compact_console_update_casts_declared_types(self):
+        out = self.run_models(
+            "from console import HBNBCommand\n"
+            "from models.place import Place\n"
+            "pl = Place()\n"
+            "HBNBCommand().onecmd('update Place {} max_guest 4'"
+            ".format(pl.id))\n"
+            "HBNBCommand().onecmd('update Place {} color red'"
+            ".format(pl.id))\n"
+            "print(repr(pl.max_guest), pl._extra)\n")
+        self.assertEqual("4 {'color': 'red'}\n", out)
+
+
+class TestBaseModel_intern(unittest.TestCase):
+    """Unittests for testing the interning of foreign key strings."""
+
+    def fresh(self, value):
+        """Return a str equal to value that is not the same object."""
+        return "".join(list(value))
+
+    def test_foreign_keys_inherited(self):
+        from models.place import Place
+        self.assertEqual({}, BaseModel._foreign_keys)
+        self.assertEqual({"city_id": "City", "user_id": "User",
+                          "amenity_ids": "Amenity"}, Place._foreign_keys)
+
+        class Suite(Place):
+            _foreign_keys = {"owner_id": "User"}
+        self.addCleanup(classes.pop, "Suite")
+        self.assertEqual(dict(Place._foreign_keys, owner_id="User"),
+                         Suite._foreign_keys)
+
+    def test_from_dict_interns_foreign_keys(self):
+        from models.review import Review
+        odict = Review().to_dict()
+        odict["place_id"] = self.fresh("a-place-id")
+        odict["text"] = self.fresh("Great place")
+        first = Review.from_dict(odict)
+        odict["place_id"] = self.fresh("a-place-id")
+        odict["text"] = self.fresh("Great place")
+        second = Review.from_dict(odict)
+        self.assertIs(first.place_id, second.place_id)
+        self.assertIsNot(first.text, second.text)
+
+    def test_setattr_interns_foreign_keys(self):
+        from models.city import City
+        first, second = City(), City()
+        first.state_id = self.fresh("a-state-id")
+        second.state_id = self.fresh("a-state-id")
+        self.assertIs(first.state_id, second.state_id)
+
+    def test_intern_keys(self):
+        from models.city import City
+        attrs = {"state_id": self.fresh("a-state-id"),
+                 "__class__": self.fresh("City")}
+        intern_keys(City, attrs)
+        self.assertIs(sys.intern("a-state-id"), attrs["state_id"])
+        self.assertIs(sys.intern("City"), attrs["__class__"])
+
+    def test_intern_keys_copies_id_lists(self):
+        from models.place import Place
+        ids = [self.fresh("an-amenity-id")]
+        attrs = {"amenity_ids": ids}
+        intern_keys(Place, attrs)
+        self.assertIsNot(ids, attrs["amenity_ids"])
+        self.assertIs(sys.intern("an-amenity-id"), attrs["amenity_ids"][0])
+
+    def test_intern_keys_skips_non_str(self):
+        from models.city import City
+        attrs = {"state_id": None}
+        intern_keys(City, attrs)
+        self.assertIsNone(attrs["state_id"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/column_store.py.
+
+Unittest classes:
+    TestColumnStore_table
+    TestColumnStore_row
+"""
+import unittest
+from array import array
+from models.base_model import BaseModel
+from models.engine.column_store import ColumnStore, Row
+from models.place import Place
+from models.review import Review
+
+DT = "2017-09-28T21:05:54.119427"
+
+
+def record(cls, id, **attrs):
+    """Return a to_dict() style dictionary of an object."""
+    rdict = {"id": id, "created_at": DT, "updated_at": DT}
+    rdict.update(attrs)
+    rdict["__class__"] = cls.__name__
+    return rdict
+
+
+class TestColumnStore_table(unittest.TestCase):
+    """Unittests for testing the tables of the ColumnStore class."""
+
+    def setUp(self):
+        self.store = ColumnStore()
+        self.store.add(record(Place, "1", price_by_night=80, latitude=1.5))
+        self.store.add(record(Place, "2", price_by_night=120))
+        self.store.add(record(Review, "3", text="Great"))
+        self.places = self.store.table(Place)
+
+    def test_len(self):
+        self.assertEqual(3, len(self.store))
+        self.assertEqual(2, len(self.places))
+
+    def test_table_by_name(self):
+        self.assertIs(self.places, self.store.table("Place"))
+
+    def test_empty_table(self):
+        self.assertEqual(0, len(self.store.table(BaseModel)))
+
+    def test_typed_columns(self):
+        self.assertEqual(array("q", [80, 120]),
+                         self.places.column("price_by_night"))
+        self.assertEqual(array("d", [1.5, 0.0]),
+                         self.places.column("latitude"))
+        self.assertEqual(["", ""], self.places.column("name"))
+
+    def test_strings_are_interned(self):
+        self.store.add(record(Review, "4", text="".join(["Gre", "at"])))
+        texts = self.store.table(Review).column("text")
+        self.assertIs(texts[0], texts[1])
+
+    def test_aggregations(self):
+        self.assertEqual(200, self.places.sum("price_by_night"))
+        self.assertEqual(80, self.places.min("price_by_night"))
+        self.assertEqual(120, self.places.max("price_by_night"))
+        self.assertEqual(100, self.places.mean("price_by_night"))
+
+    def test_aggregations_read_misfit_values(self):
+        self.store.add(record(Place, "5", price_by_night=50.5))
+        self.assertEqual(250.5, self.places.sum("price_by_night"))
+        self.assertEqual(83.5, self.places.mean("price_by_night"))
+        self.assertEqual(50.5, self.places.min("price_by_night"))
+        self.assertEqual([80, 120, 50.5], self.places.values("price_by_night"))
+        self.assertEqual([2], self.places.where("price_by_night",
+                                                lambda v: v < 60))
+        self.store.add(record(Place, "6", price_by_night="cheap"))
+        with self.assertRaises(TypeError):
+            self.places.sum("price_by_night")
+
+    def test_mean_of_empty_table(self):
+        with self.assertRaises(ValueError):
+            ColumnStore().table(Place).mean("price_by_night")
+
+    def test_where(self):
+        self.assertEqual([1], self.places.where("price_by_night",
+                                                lambda v: v > 100))
+
+    def test_mistyped_value_kept_exactly(self):
+        self.store.add(record(Place, "5", max_guest="four"))
+        row = self.places.row("5")
+        self.assertEqual("four", row.max_guest)
+        self.assertEqual(0, self.places.column("max_guest")[2])
+        self.assertEqual("four", row.to_dict()["max_guest"])
+
+    def test_overflowing_int_kept_exactly(self):
+        self.store.add(record(Place, "5", number_rooms=1 << 70))
+        self.assertEqual(1 << 70, self.places.row("5").number_rooms)
+
+
+class TestColumnStore_row(unittest.TestCase):
+    """Unittests for testing the Row class."""
+
+    def setUp(self):
+        self.odict = record(Place, "1", name="Loft", price_by_night=80,
+                            amenity_ids=["a"], pets=True)
+        self.store = ColumnStore()
+        self.store.add(self.odict)
+        self.row = self.store.table(Place).row("1")
+
+    def test_row_type(self):
+        self.assertEqual(Row, type(self.row))
+
+    def test_missing_row(self):
+        self.assertIsNone(self.store.table(Place).row("2"))
+
+    def test_attributes(self):
+        self.assertEqual("1", self.row.id)
+        self.assertEqual(DT, self.row.created_at)
+        self.assertEqual("Loft", self.row.name)
+        self.assertEqual(80, self.row.price_by_night)
+        self.assertEqual(0, self.row.max_guest)
+        self.assertTrue(self.row.pets)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.row.color
+
+    def test_to_dict(self):
+        self.assertEqual(self.odict, self.row.to_dict())
+
+    def test_unset_attributes_not_in_to_dict(self):
+        self.assertNotIn("max_guest", self.row.to_dict())
+
+    def test_materialize(self):
+        pl = self.row.materialize()
+        self.assertEqual(Place, type(pl))
+        self.assertEqual(self.odict, pl.to_dict())
+
+    def test_str(self):
+        self.assertEqual(str(Place.from_dict(self.odict)), str(self.row))
+
+    def test_iter(self):
+        self.assertEqual(["1"], [r.id for r in self.store.table(Place)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/compactor.py.
+
+Unittest classes:
+    TestCompactor
+"""
+import unittest
+from models.engine.compactor import Compactor
+
+
+class FakeStorage:
+    """Storage stub recording compaction calls."""
+
+    def __init__(self, needed):
+        self.needed = needed
+        self.compactions = 0
+
+    def needs_compaction(self):
+        return self.needed
+
+    def compact(self):
+        self.compactions += 1
+        self.needed = False
+
+
+class TestCompactor(unittest.TestCase):
+    """Unittests for testing the Compactor thread."""
+
+    def test_compactor_is_daemon(self):
+        self.assertTrue(Compactor(FakeStorage(False)).daemon)
+
+    def test_compacts_when_needed(self):
+        storage = FakeStorage(True)
+        compactor = Compactor(storage, 0.01)
+        compactor.start()
+        for _ in range(200):
+            if storage.compactions:
+                break
+            compactor.join(0.01)
+        compactor.stop()
+        self.assertEqual(1, storage.compactions)
+
+    def test_skips_when_not_needed(self):
+        storage = FakeStorage(False)
+        compactor = Compactor(storage, 0.01)
+        compactor.start()
+        compactor.join(0.05)
+        compactor.stop()
+        self.assertEqual(0, storage.compactions)
+        self.assertFalse(compactor.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/db_storage.py.
+
+Unittest classes:
+    TestDBStorage_instantiation
+    TestDBStorage_methods
+"""
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from models.base_model import BaseModel, classes
+from models.engine.db_storage import DBStorage
+from models.user import User
+from models.state import State
+from models.place import Place
+from models.city import City
+from models.amenity import Amenity
+from models.review import Review
+
+
+class TestDBStorage_instantiation(unittest.TestCase):
+    """Unittests for testing instantiation of the DBStorage class."""
+
+    def test_DBStorage_instantiation_no_args(self):
+        self.assertEqual(type(DBStorage()), DBStorage)
+
+    def test_DBStorage_instantiation_with_arg(self):
+        with self.assertRaises(TypeError):
+            DBStorage(None)
+
+    def test_DBStorage_db_path_is_private_str(self):
+        self.assertEqual(str, type(DBStorage._DBStorage__db_path))
+
+
+class TestDBStorage_methods(unittest.TestCase):
+    """Unittests for testing methods of the DBStorage class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "hbnb.db")
+        self.path_patch = patch.object(DBStorage, "_DBStorage__db_path",
+                                       self.db_path)
+        self.path_patch.start()
+        self.storage = DBStorage()
+        self.storage.reload()
+        self.models_patch = patch("models.storage", self.storage)
+        self.models_patch.start()
+
+    def tearDown(self):
+        self.models_patch.stop()
+        self.storage.close()
+        self.path_patch.stop()
+        self.tmpdir.cleanup()
+
+    def reopen(self):
+        self.storage.close()
+        self.storage = DBStorage()
+        self.storage.reload()
+        return self.storage.all()
+
+    def test_one_table_per_class(self):
+        conn = sqlite3.connect(self.db_path)
+        tables = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        self.assertEqual({"BaseModel", "User", "State", "City", "Place",
+                          "Amenity", "Review"}, tables)
+
+    def test_wal_mode(self):
+        conn = sqlite3.connect(self.db_path)
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+        self.assertEqual("wal", mode)
+
+    def test_all_with_cls(self):
+        us = User()
+        State()
+        self.assertEqual({"User." + us.id: us}, self.storage.all(User))
+        self.assertEqual({}, self.storage.all("MyModel"))
+
+    def test_count(self):
+        us = User()
+        User()
+        State()
+        self.assertEqual(3, self.storage.count())
+        self.assertEqual(2, self.storage.count("User"))
+        self.storage.delete(us)
+        self.assertEqual(1, self.storage.count(User))
+
+    def test_keys(self):
+        us = User()
+        st = State()
+        us2 = User()
+        self.assertEqual(["User." + us.id, "User." + us2.id],
+                         self.storage.keys(limit=2))
+        self.assertEqual(["State." + st.id], self.storage.keys(offset=2))
+        self.assertEqual(["User." + us2.id],
+                         self.storage.keys(User, after="User." + us.id))
+        self.assertEqual([], self.storage.keys("MyModel"))
+        with self.assertRaises(KeyError):
+            self.storage.keys(User, after="State." + st.id)
+
+    def test_count_after_reload(self):
+        User()
+        self.storage.save()
+        self.reopen()
+        self.assertEqual(1, self.storage.count(User))
+
+    def test_children(self):
+        st = State()
+        ct = City()
+        ct.state_id = st.id
+        City()
+        self.assertEqual({"City." + ct.id: ct},
+                         self.storage.children(st, City))
+        self.assertEqual({}, self.storage.children(st, "Place"))
+
+    def test_children_of_all(self):
+        wifi = Amenity()
+        pool = Amenity()
+        pl = Place()
+        pl.amenity_ids = [wifi.id, pool.id]
+        Place().amenity_ids = [wifi.id]
+        self.assertEqual({"Place." + pl.id: pl},
+                         self.storage.children_of_all([wifi, pool], Place))
+
+    def test_ids_in_range(self):
+        pls = []
+        for price in (120, 80, 300):
+            pl = Place()
+            pl.price_by_night = price
+            pls.append(pl)
+        self.assertEqual([pls[1].id, pls[0].id], self.storage.ids_in_range(
+            Place, "price_by_night", 50, 200))
+        self.assertEqual([pls[2].id], self.storage.ids_in_range(
+            Place, "price_by_night", reverse=True, limit=1))
+        with self.assertRaises(ValueError):
+            self.storage.ids_in_range(Place, "name")
+
+    def test_query(self):
+        ct = City()
+        pls = []
+        for price in (120, 80, 300):
+            pl = Place()
+            pl.city_id = ct.id
+            pl.price_by_night = price
+            pls.append(pl)
+        Place().price_by_night = 50
+        q = self.storage.query(Place).where(city_id=ct.id,
+                                            price_by_night__lt=200)
+        self.assertEqual([pls[1], pls[0]],
+                         q.order_by("price_by_night").all())
+        self.assertIn("scan: class index (4 objects)", q.explain())
+
+    def test_within_and_nearest(self):
+        pls = []
+        for lat, lon in ((37.77, -122.42), (37.80, -122.27), (40.71, -74.0)):
+            pl = Place()
+            pl.latitude = lat
+            pl.longitude = lon
+            pls.append(pl)
+        self.assertEqual([pls[0].id, pls[1].id], self.storage.within(
+            Place, 37.77, -122.42, 50))
+        self.assertEqual([pls[2].id], self.storage.nearest(
+            Place, 40.0, -74.0, 1))
+        with self.assertRaises(ValueError):
+            self.storage.nearest(City, 0.0, 0.0, 1)
+
+    def test_search(self):
+        pl = Place()
+        pl.name = "Loft"
+        rv = Review()
+        rv.text = "Great loft, but the street was loud at night"
+        self.assertEqual(["Place." + pl.id, "Review." + rv.id],
+                         list(self.storage.search("loft")))
+        self.assertEqual({"Review." + rv.id: rv},
+                         self.storage.search("loft", Review))
+
+    def test_new(self):
+        us = User()
+        self.assertIn("User." + us.id, self.storage.all())
+        self.assertIs(us, self.storage.all()["User." + us.id])
+
+    def test_get(self):
+        us = User()
+        self.assertIs(us, self.storage.get(User, us.id))
+        self.assertIs(us, self.storage.get("User", us.id))
+        self.assertIsNone(self.storage.get(State, us.id))
+
+    def test_save_and_reload(self):
+        objs = [BaseModel(), User(), State(), City(), Place(), Amenity(),
+                Review()]
+        self.storage.save()
+        reloaded = self.reopen()
+        for obj in objs:
+            key = "{}.{}".format(obj.__class__.__name__, obj.id)
+            self.assertIn(key, reloaded)
+            self.assertEqual(obj.to_dict(), reloaded[key].to_dict())
+
+    def test_reload_keeps_attribute_types(self):
+        pl = Place()
+        pl.name = "Loft"
+        pl.max_guest = 4
+        pl.latitude = 7.5
+        pl.amenity_ids = ["a", "b"]
+        pl.my_number = 98
+        self.storage.save()
+        reloaded = self.reopen()["Place." + pl.id]
+        self.assertEqual(pl.to_dict(), reloaded.to_dict())
+        self.assertNotIn("description", reloaded.__dict__)
+
+    def test_reload_keeps_values_and_order(self):
+        pl = Place()
+        pl.my_number = 98
+        pl.name = 5
+        pl.price_by_night = "80"
+        pl.latitude = 7
+        pl.description = None
+        pl.max_guest = 2 ** 70
+        self.storage.save()
+        reloaded = self.reopen()["Place." + pl.id]
+        self.assertEqual(list(pl.to_dict().items()),
+                         list(reloaded.to_dict().items()))
+        self.assertEqual(str(pl), str(reloaded))
+
+    def test_class_defined_after_connect(self):
+        class Booking(BaseModel):
+            nights = 0
+        self.addCleanup(classes.pop, "Booking")
+        self.storage.reload()
+        bk = Booking()
+        bk.nights = 3
+        self.storage.save()
+        self.assertEqual(3, self.reopen()["Booking." + bk.id].nights)
+
+    def test_save_writes_updates(self):
+        st = State()
+        self.storage.save()
+        st.name = "California"
+        self.storage.save()
+        self.assertEqual("California", self.reopen()["State." + st.id].name)
+
+    def test_save_writes_deletes(self):
+        st = State()
+        self.storage.save()
+        self.storage.delete(st)
+        self.storage.save()
+        self.assertNotIn("State." + st.id, self.reopen())
+
+    def test_reload_subset_of_classes(self):
+        st = State()
+        pl = Place()
+        self.storage.save()
+        self.storage.close()
+        self.storage = DBStorage()
+        self.storage.reload(classes=[State])
+        self.assertIn("State." + st.id, self.storage.all())
+        self.assertNotIn("Place." + pl.id, self.storage.all())
+
+    def test_compact(self):
+        State()
+        self.storage.save()
+        self.assertTrue(self.storage.compact())
+        self.assertFalse(self.storage.needs_compaction())
+
+
+if __name__ == "__main__":
+    unittest.main()
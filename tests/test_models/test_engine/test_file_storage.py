@@ -4,13 +4,24 @@
 Unittest classes:
     TestFileStorage_instantiation
     TestFileStorage_methods
+    TestFileStorage_journal
+    TestFileStorage_sharded
+    TestFileStorage_lazy
+    TestFileStorage_durability
+    TestFileStorage_write_behind
+    TestFileStorage_children
+    TestFileStorage_ranges
+    TestFileStorage_geo
+    TestFileStorage_search
 """
 import os
 import json
+import sys
 import models
 import unittest
 from datetime import datetime
-from models.base_model import BaseModel
+from unittest.mock import patch
+from models.base_model import BaseModel, classes
 from models.engine.file_storage import FileStorage
 from models.user import User
 from models.state import State
@@ -66,8 +77,45 @@ class TestFileStorage_methods(unittest.TestCase):
         self.assertEqual(dict, type(models.storage.all()))
 
     def test_all_with_arg(self):
+        self.assertIs(models.storage.all(), models.storage.all(None))
         with self.assertRaises(TypeError):
-            models.storage.all(None)
+            models.storage.all(None, None)
+
+    def test_all_with_cls(self):
+        us = User()
+        st = State()
+        self.assertEqual({"User." + us.id: us}, models.storage.all(User))
+        self.assertEqual({"State." + st.id: st}, models.storage.all("State"))
+        self.assertEqual({}, models.storage.all("MyModel"))
+
+    def test_all_with_cls_returns_new_dict(self):
+        us = User()
+        models.storage.all(User).clear()
+        self.assertIs(us, models.storage.get(User, us.id))
+
+    def test_count(self):
+        User()
+        User()
+        State()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual(1, models.storage.count("State"))
+        self.assertEqual(0, models.storage.count("MyModel"))
+
+    def test_count_after_delete(self):
+        us = User()
+        self.assertEqual(1, models.storage.count(User))
+        models.storage.delete(us)
+        self.assertEqual(0, models.storage.count(User))
+        self.assertEqual({}, models.storage.all(User))
+
+    def test_count_after_reload(self):
+        User()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(0, models.storage.count(User))
+        models.storage.reload()
+        self.assertEqual(1, models.storage.count(User))
 
     def test_new(self):
         bm = BaseModel()
@@ -134,6 +182,44 @@ class TestFileStorage_methods(unittest.TestCase):
         with self.assertRaises(TypeError):
             models.storage.save(None)
 
+    def test_save_reserializes_only_changed_objects(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        bm.__dict__["name"] = "untracked"
+        us.name = "tracked"
+        models.storage.save()
+        with open("file.json", "r") as f:
+            objs = json.load(f)
+        self.assertNotIn("name", objs["BaseModel." + bm.id])
+        self.assertEqual("tracked", objs["User." + us.id]["name"])
+
+    def test_save_after_touch(self):
+        pl = Place()
+        models.storage.save()
+        pl.__dict__["amenity_ids"] = ["123"]
+        models.storage.touch(pl)
+        models.storage.save()
+        with open("file.json", "r") as f:
+            objs = json.load(f)
+        self.assertEqual(["123"], objs["Place." + pl.id]["amenity_ids"])
+
+    def test_save_after_delete(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        models.storage.delete(us)
+        models.storage.save()
+        with open("file.json", "r") as f:
+            objs = json.load(f)
+        self.assertEqual(["BaseModel." + bm.id], list(objs))
+
+    def test_delete_unstored_object(self):
+        bm = BaseModel(id="1", created_at="2017-09-28T21:05:54.119427",
+                       updated_at="2017-09-28T21:05:54.119427")
+        models.storage.delete(bm)
+        self.assertNotIn("BaseModel.1", models.storage.all())
+
     def test_reload(self):
         bm = BaseModel()
         us = User()
@@ -160,10 +246,907 @@ class TestFileStorage_methods(unittest.TestCase):
         self.assertIn("Amenity." + am.id, objs)
         self.assertIn("Review." + rv.id, objs)
 
+    def test_get(self):
+        us = User()
+        self.assertIs(us, models.storage.get(User, us.id))
+        self.assertIs(us, models.storage.get("User", us.id))
+        self.assertIsNone(models.storage.get(State, us.id))
+        self.assertIsNone(models.storage.get(User, "1234"))
+
+    def test_reload_registered_class(self):
+        class Booking(BaseModel):
+            nights = 0
+
+        self.addCleanup(classes.pop, "Booking")
+        bk = Booking()
+        bk.nights = 3
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        reloaded = models.storage.all()["Booking." + bk.id]
+        self.assertIs(Booking, type(reloaded))
+        self.assertEqual(3, reloaded.nights)
+
     def test_reload_with_arg(self):
         with self.assertRaises(TypeError):
             models.storage.reload(None)
 
 
+class TestFileStorage_journal(unittest.TestCase):
+    """Unittests for testing the journal mode of the FileStorage class."""
+
+    def setUp(self):
+        for name in ("file.json", "file.json.log", "file.json.log.1"):
+            try:
+                os.rename(name, name + ".tmp")
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = set()
+        FileStorage._FileStorage__journal = True
+
+    def tearDown(self):
+        for name in ("file.json", "file.json.log", "file.json.log.1"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+            try:
+                os.rename(name + ".tmp", name)
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = set()
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__log_records = 0
+        FileStorage._FileStorage__log_keys = set()
+
+    def test_save_appends_only_changed_objects(self):
+        bm = BaseModel()
+        models.storage.save()
+        us = User()
+        models.storage.save()
+        with open("file.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(2, len(lines))
+        self.assertIn("BaseModel." + bm.id, lines[0])
+        self.assertIn("User." + us.id, lines[1])
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_reload_replays_deletes_into_count(self):
+        us = User()
+        User()
+        models.storage.save()
+        models.storage.delete(us)
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(1, models.storage.count(User))
+        self.assertNotIn("User." + us.id, models.storage.all(User))
+
+    def test_save_without_changes_appends_nothing(self):
+        BaseModel()
+        models.storage.save()
+        models.storage.save()
+        with open("file.json.log", "r") as f:
+            self.assertEqual(1, len(f.readlines()))
+
+    def test_reload_replays_updates_and_deletes(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        bm.name = "Holberton"
+        bm.save()
+        models.storage.delete(us)
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        objs = FileStorage._FileStorage__objects
+        self.assertEqual("Holberton", objs["BaseModel." + bm.id].name)
+        self.assertNotIn("User." + us.id, objs)
+
+    def test_reload_ignores_truncated_record(self):
+        bm = BaseModel()
+        models.storage.save()
+        with open("file.json.log", "a") as f:
+            f.write('{"op": "put", "key": "User.1", "ob')
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        objs = FileStorage._FileStorage__objects
+        self.assertIn("BaseModel." + bm.id, objs)
+        self.assertNotIn("User.1", objs)
+
+    def test_full_save_folds_journal_into_snapshot(self):
+        bm = BaseModel()
+        models.storage.save()
+        FileStorage._FileStorage__journal = False
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json.log"))
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("BaseModel." + bm.id, models.storage.all())
+
+    def test_reload_appends_after_truncated_record(self):
+        BaseModel()
+        models.storage.save()
+        with open("file.json.log", "a") as f:
+            f.write('{"op": "put", "key": "User.1", "ob')
+        models.storage.reload()
+        us = User()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("User." + us.id, models.storage.all())
+
+    def test_needs_compaction_on_dead_records(self):
+        bm = BaseModel()
+        models.storage.save()
+        self.assertFalse(models.storage.needs_compaction())
+        bm.save()
+        self.assertTrue(models.storage.needs_compaction())
+
+    def test_needs_compaction_without_journal(self):
+        self.assertFalse(models.storage.needs_compaction())
+
+    def test_compact(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        models.storage.delete(us)
+        models.storage.save()
+        self.assertTrue(models.storage.compact())
+        self.assertFalse(os.path.exists("file.json.log"))
+        self.assertFalse(os.path.exists("file.json.log.1"))
+        self.assertFalse(models.storage.needs_compaction())
+        with open("file.json", "r") as f:
+            snapshot = json.load(f)
+        self.assertEqual(["BaseModel." + bm.id], list(snapshot))
+
+    def test_compact_keeps_later_journal(self):
+        bm = BaseModel()
+        models.storage.save()
+        models.storage.compact()
+        us = User()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("BaseModel." + bm.id, models.storage.all())
+        self.assertIn("User." + us.id, models.storage.all())
+
+    def test_reload_replays_leftover_segment(self):
+        bm = BaseModel()
+        models.storage.save()
+        os.rename("file.json.log", "file.json.log.1")
+        us = User()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("BaseModel." + bm.id, models.storage.all())
+        self.assertIn("User." + us.id, models.storage.all())
+
+
+class TestFileStorage_sharded(unittest.TestCase):
+    """Unittests for testing the sharded mode of the FileStorage class."""
+
+    files = ("file.json", "BaseModel.json", "User.json", "State.json",
+             "City.json", "Place.json", "Amenity.json", "Review.json")
+
+    def setUp(self):
+        for name in self.files:
+            try:
+                os.rename(name, name + ".tmp")
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = set()
+        FileStorage._FileStorage__sharded = True
+
+    def tearDown(self):
+        for name in self.files:
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+            try:
+                os.rename(name + ".tmp", name)
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = set()
+        FileStorage._FileStorage__sharded = False
+        FileStorage._FileStorage__loaded = None
+
+    def test_save_writes_one_file_per_class(self):
+        us = User()
+        pl = Place()
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json"))
+        self.assertFalse(os.path.exists("State.json"))
+        with open("User.json", "r") as f:
+            self.assertEqual(["User." + us.id], list(json.load(f)))
+        with open("Place.json", "r") as f:
+            self.assertEqual(["Place." + pl.id], list(json.load(f)))
+
+    def test_save_rewrites_only_dirty_classes(self):
+        us = User()
+        Place()
+        models.storage.save()
+        with open("Place.json", "w") as f:
+            f.write("{}")
+        us.first_name = "Betty"
+        models.storage.save()
+        with open("Place.json", "r") as f:
+            self.assertEqual("{}", f.read())
+        with open("User.json", "r") as f:
+            self.assertIn("Betty", f.read())
+
+    def test_save_after_delete(self):
+        us = User()
+        models.storage.save()
+        models.storage.delete(us)
+        models.storage.save()
+        with open("User.json", "r") as f:
+            self.assertEqual({}, json.load(f))
+
+    def test_reload_subset_of_classes(self):
+        st = State()
+        pl = Place()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload(classes=[State])
+        self.assertIn("State." + st.id, models.storage.all())
+        self.assertNotIn("Place." + pl.id, models.storage.all())
+
+    def test_reload_subset_by_name(self):
+        st = State()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload(classes=["State"])
+        self.assertIn("State." + st.id, models.storage.all())
+
+    def test_save_after_partial_reload_keeps_unloaded_objects(self):
+        pl1 = Place()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload(classes=[State])
+        pl2 = Place()
+        models.storage.save()
+        with open("Place.json", "r") as f:
+            keys = json.load(f).keys()
+        self.assertIn("Place." + pl1.id, keys)
+        self.assertIn("Place." + pl2.id, keys)
+
+    def test_partial_save_overrides_single_file(self):
+        st1 = State()
+        st2 = State()
+        ct = City()
+        FileStorage._FileStorage__sharded = False
+        models.storage.save()
+        FileStorage._FileStorage__sharded = True
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload(classes=["State"])
+        models.storage.delete(models.storage.get(State, st1.id))
+        ct2 = City()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertNotIn("State." + st1.id, models.storage.all())
+        self.assertIn("State." + st2.id, models.storage.all())
+        self.assertIn("City." + ct.id, models.storage.all())
+        self.assertIn("City." + ct2.id, models.storage.all())
+
+    def test_compact_overrides_single_file(self):
+        st = State()
+        FileStorage._FileStorage__sharded = False
+        models.storage.save()
+        FileStorage._FileStorage__sharded = True
+        FileStorage._FileStorage__journal = True
+        try:
+            FileStorage._FileStorage__objects = {}
+            models.storage.reload()
+            models.storage.delete(models.storage.get(State, st.id))
+            models.storage.save()
+            models.storage.compact()
+            self.assertFalse(os.path.exists("file.json"))
+            FileStorage._FileStorage__objects = {}
+            models.storage.reload()
+            self.assertNotIn("State." + st.id, models.storage.all())
+        finally:
+            FileStorage._FileStorage__journal = False
+            for name in ("file.json.log", "file.json.log.1"):
+                try:
+                    os.remove(name)
+                except IOError:
+                    pass
+
+    def test_save_splits_single_file(self):
+        us = User()
+        FileStorage._FileStorage__sharded = False
+        models.storage.save()
+        FileStorage._FileStorage__sharded = True
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json"))
+        with open("User.json", "r") as f:
+            self.assertIn("User." + us.id, json.load(f))
+
+
+class TestFileStorage_lazy(unittest.TestCase):
+    """Unittests for testing the lazy mode of the FileStorage class."""
+
+    def setUp(self):
+        for name in ("file.json", "file.json.log"):
+            try:
+                os.rename(name, name + ".tmp")
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__raw = {}
+        FileStorage._FileStorage__lazy = True
+        self.us = User()
+        self.pl = Place()
+        self.pl.name = "Loft"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+
+    def tearDown(self):
+        for name in ("file.json", "file.json.log"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+            try:
+                os.rename(name + ".tmp", name)
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__raw = {}
+        FileStorage._FileStorage__lazy = False
+        FileStorage._FileStorage__journal = False
+
+    def test_reload_defers_instantiation(self):
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+        raw = FileStorage._FileStorage__raw
+        self.assertIn("User." + self.us.id, raw)
+        self.assertIn("Place." + self.pl.id, raw)
+
+    def test_get_instantiates_one_object(self):
+        pl = models.storage.get(Place, self.pl.id)
+        self.assertEqual(Place, type(pl))
+        self.assertEqual("Loft", pl.name)
+        self.assertIs(pl, models.storage.get(Place, self.pl.id))
+        self.assertNotIn("User." + self.us.id,
+                         FileStorage._FileStorage__objects)
+
+    def test_all_instantiates_every_object(self):
+        objs = models.storage.all()
+        self.assertEqual(User, type(objs["User." + self.us.id]))
+        self.assertEqual(Place, type(objs["Place." + self.pl.id]))
+        self.assertEqual({}, FileStorage._FileStorage__raw)
+
+    def test_save_keeps_raw_objects(self):
+        us = models.storage.get(User, self.us.id)
+        us.first_name = "Betty"
+        models.storage.save()
+        with open("file.json", "r") as f:
+            objs = json.load(f)
+        self.assertEqual("Betty", objs["User." + self.us.id]["first_name"])
+        self.assertEqual("Loft", objs["Place." + self.pl.id]["name"])
+
+    def test_delete(self):
+        models.storage.delete(models.storage.get(Place, self.pl.id))
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertNotIn("Place." + self.pl.id, json.load(f))
+
+    def test_journal_replay_is_lazy(self):
+        FileStorage._FileStorage__journal = True
+        st = State()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("State." + st.id, FileStorage._FileStorage__raw)
+        self.assertIs(State, type(models.storage.get(State, st.id)))
+
+    def test_all_with_cls_instantiates_that_class(self):
+        objs = models.storage.all(Place)
+        self.assertEqual(Place, type(objs["Place." + self.pl.id]))
+        self.assertIn("User." + self.us.id, FileStorage._FileStorage__raw)
+        self.assertEqual(1, models.storage.count(User))
+
+    def test_keys_reads_nothing(self):
+        self.assertEqual(["User." + self.us.id, "Place." + self.pl.id],
+                         models.storage.keys())
+        self.assertEqual(["Place." + self.pl.id],
+                         models.storage.keys(offset=1, limit=5))
+        self.assertEqual(["Place." + self.pl.id], models.storage.keys(Place))
+        self.assertEqual([], models.storage.keys("Place", offset=1))
+        self.assertEqual(["Place." + self.pl.id],
+                         models.storage.keys(after="User." + self.us.id))
+        with self.assertRaises(KeyError):
+            models.storage.keys(Place, after="User." + self.us.id)
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+
+    def test_query_page_reads_only_page(self):
+        pls = [Place() for _ in range(4)]
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        q = models.storage.query(Place).offset(2).limit(2)
+        self.assertEqual([pl.id for pl in pls[1:3]], [pl.id for pl in q])
+        self.assertEqual(["Place." + pl.id for pl in pls[1:3]],
+                         list(FileStorage._FileStorage__objects))
+
+    def test_reload_interns_raw_foreign_keys(self):
+        ct = City()
+        ct.state_id = "a-state-id"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        o = FileStorage._FileStorage__raw["City." + ct.id]
+        self.assertIs(sys.intern("a-state-id"), o["state_id"])
+        self.assertIs(sys.intern("City"), o["__class__"])
+
+    def test_columns_keeps_objects_raw(self):
+        us = models.storage.get(User, self.us.id)
+        store = models.storage.columns()
+        self.assertEqual(us.to_dict(), store.table(User).row(us.id).to_dict())
+        self.assertEqual("Loft", store.table(Place).row(self.pl.id).name)
+        self.assertIn("Place." + self.pl.id, FileStorage._FileStorage__raw)
+
+
+class TestFileStorage_durability(unittest.TestCase):
+    """Unittests for testing the crash safety of FileStorage saves."""
+
+    def setUp(self):
+        for name in ("file.json", "file.json.log"):
+            try:
+                os.rename(name, name + ".tmp")
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        self.bm = BaseModel()
+        models.storage.save()
+
+    def tearDown(self):
+        for name in ("file.json", "file.json.log", "file.json.tmp"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        for name in ("file.json", "file.json.log"):
+            try:
+                os.rename(name + ".tmp", name)
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__durability = "none"
+        FileStorage._FileStorage__journal = False
+
+    def test_crash_mid_save_keeps_previous_file(self):
+        def crash(pairs, f):
+            f.write('{"BaseModel.')
+            raise KeyboardInterrupt
+
+        us = User()
+        with patch("models.engine.file_storage.dump_fragments", crash):
+            with self.assertRaises(KeyboardInterrupt):
+                models.storage.save()
+        with open("file.json", "r") as f:
+            objs = json.load(f)
+        self.assertIn("BaseModel." + self.bm.id, objs)
+        self.assertNotIn("User." + us.id, objs)
+
+    def test_fsync_calls_on_save(self):
+        for level, calls in (("none", 0), ("flush", 1), ("fsync", 2)):
+            FileStorage._FileStorage__durability = level
+            User()
+            with patch("os.fsync") as fsync:
+                models.storage.save()
+            self.assertEqual(calls, fsync.call_count, level)
+
+    def test_fsync_calls_on_journal_append(self):
+        FileStorage._FileStorage__journal = True
+        for level, calls in (("none", 0), ("flush", 1), ("fsync", 2)):
+            FileStorage._FileStorage__durability = level
+            try:
+                os.remove("file.json.log")
+            except IOError:
+                pass
+            User()
+            with patch("os.fsync") as fsync:
+                models.storage.save()
+            self.assertEqual(calls, fsync.call_count, level)
+
+    def test_every_level_saves(self):
+        for level in ("none", "flush", "fsync"):
+            FileStorage._FileStorage__durability = level
+            us = User()
+            models.storage.save()
+            with open("file.json", "r") as f:
+                self.assertIn("User." + us.id, json.load(f))
+            self.assertFalse(os.path.exists("file.json.tmp"))
+
+
+class TestFileStorage_write_behind(unittest.TestCase):
+    """Unittests for testing the write-behind mode of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__write_behind = 60
+
+    def tearDown(self):
+        models.storage.close()
+        FileStorage._FileStorage__write_behind = 0
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_saves_are_coalesced(self):
+        with patch.object(FileStorage, "flush",
+                          wraps=models.storage.flush) as flush:
+            BaseModel().save()
+            FileStorage._FileStorage__flusher.join(0.1)
+            for _ in range(50):
+                BaseModel().save()
+            self.assertEqual(1, flush.call_count)
+
+    def test_close_writes_pending_changes(self):
+        objs = [User() for _ in range(5)]
+        for obj in objs:
+            obj.save()
+        models.storage.close()
+        self.assertIsNone(FileStorage._FileStorage__flusher)
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        for obj in objs:
+            self.assertIn("User." + obj.id, saved)
+
+    def test_close_without_flusher(self):
+        FileStorage._FileStorage__write_behind = 0
+        BaseModel()
+        models.storage.close()
+        self.assertFalse(os.path.exists("file.json"))
+
+
+class TestFileStorage_children(unittest.TestCase):
+    """Unittests for testing the foreign key indexes of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.st = State()
+        self.ct = City()
+        self.ct.state_id = self.st.id
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__raw = {}
+        FileStorage._FileStorage__lazy = False
+
+    def test_children(self):
+        self.assertEqual({"City." + self.ct.id: self.ct},
+                         models.storage.children(self.st, City))
+
+    def test_children_by_class_name(self):
+        self.assertEqual({"City." + self.ct.id: self.ct},
+                         models.storage.children(self.st, "City"))
+
+    def test_children_of_unrelated_class(self):
+        self.assertEqual({}, models.storage.children(self.st, Review))
+
+    def test_lookup(self):
+        City().state_id = "other"
+        self.assertEqual([self.ct.id],
+                         models.storage.lookup(City, "state_id", self.st.id))
+        self.assertEqual([], models.storage.lookup("City", "state_id", "x"))
+        with self.assertRaises(ValueError):
+            models.storage.lookup(City, "name", self.st.id)
+
+    def test_children_follow_updates(self):
+        other = State()
+        self.ct.state_id = other.id
+        self.assertEqual({}, models.storage.children(self.st, City))
+        self.assertIn("City." + self.ct.id,
+                      models.storage.children(other, City))
+
+    def test_children_after_delete(self):
+        models.storage.delete(self.ct)
+        self.assertEqual({}, models.storage.children(self.st, City))
+
+    def test_children_by_each_foreign_key(self):
+        us = User()
+        pl = Place()
+        pl.user_id = us.id
+        rv = Review()
+        rv.user_id = us.id
+        rv.place_id = pl.id
+        self.assertEqual([pl], list(models.storage.children(us, Place)
+                                    .values()))
+        self.assertEqual([rv], list(models.storage.children(us, Review)
+                                    .values()))
+        self.assertEqual([rv], list(models.storage.children(pl, Review)
+                                    .values()))
+
+    def test_children_of_all(self):
+        wifi = Amenity()
+        pool = Amenity()
+        pl = Place()
+        pl.amenity_ids = [wifi.id, pool.id]
+        Place().amenity_ids = [wifi.id]
+        self.assertEqual({"Place." + pl.id: pl},
+                         models.storage.children_of_all([wifi, pool], Place))
+        self.assertEqual(2, len(models.storage.children_of_all([wifi],
+                                                               Place)))
+
+    def test_children_of_all_without_parents(self):
+        self.assertEqual(models.storage.all(City),
+                         models.storage.children_of_all([], City))
+
+    def test_amenity_list_mutated_then_touched(self):
+        wifi = Amenity()
+        pl = Place()
+        pl.amenity_ids = []
+        self.assertEqual({}, models.storage.children(wifi, Place))
+        pl.amenity_ids.append(wifi.id)
+        self.assertEqual({}, models.storage.children(wifi, Place))
+        models.storage.touch(pl)
+        self.assertIn("Place." + pl.id, models.storage.children(wifi, Place))
+
+    def test_children_after_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual([self.ct.id], [c.id for c in models.storage
+                                        .children(self.st, City).values()])
+
+    def test_children_in_lazy_mode(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        children = models.storage.children(self.st, City)
+        self.assertEqual(City, type(children["City." + self.ct.id]))
+        self.assertIn("State." + self.st.id, FileStorage._FileStorage__raw)
+
+
+class TestFileStorage_ranges(unittest.TestCase):
+    """Unittests for testing the range indexes of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.pls = []
+        for price in (120, 80, 300, 45):
+            pl = Place()
+            pl.price_by_night = price
+            self.pls.append(pl)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__raw = {}
+        FileStorage._FileStorage__ranges = {}
+        FileStorage._FileStorage__lazy = False
+
+    def ids(self, *indices):
+        return [self.pls[i].id for i in indices]
+
+    def test_ids_in_range(self):
+        self.assertEqual(self.ids(1, 0),
+                         models.storage.ids_in_range(Place, "price_by_night",
+                                                     50, 200))
+
+    def test_top_n(self):
+        self.assertEqual(self.ids(2, 0), models.storage.ids_in_range(
+            "Place", "price_by_night", reverse=True, limit=2))
+
+    def test_index_follows_changes(self):
+        models.storage.ids_in_range(Place, "price_by_night")
+        self.pls[2].price_by_night = 10
+        models.storage.delete(self.pls[3])
+        pl = Place()
+        pl.price_by_night = 100
+        self.assertEqual(self.ids(2, 1) + [pl.id, self.pls[0].id],
+                         models.storage.ids_in_range(Place,
+                                                     "price_by_night"))
+
+    def test_unset_attribute_uses_default(self):
+        pl = Place()
+        self.assertEqual([pl.id], models.storage.ids_in_range(
+            Place, "price_by_night", high=0))
+        self.assertEqual(5, len(models.storage.ids_in_range(
+            Place, "max_guest", 0, 0)))
+
+    def test_non_numeric_attribute(self):
+        with self.assertRaises(ValueError):
+            models.storage.ids_in_range(Place, "name")
+        with self.assertRaises(ValueError):
+            models.storage.ids_in_range(Place, "color")
+
+    def test_index_after_reload(self):
+        models.storage.ids_in_range(Place, "price_by_night")
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(self.ids(3, 1, 0, 2), models.storage.ids_in_range(
+            Place, "price_by_night"))
+
+    def test_index_in_lazy_mode(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        self.assertEqual(self.ids(2), models.storage.ids_in_range(
+            Place, "price_by_night", low=200))
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+
+
+class TestFileStorage_geo(unittest.TestCase):
+    """Unittests for testing the grid indexes of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.pls = []
+        for lat, lon in ((37.77, -122.42), (37.80, -122.27),
+                         (34.05, -118.24), (40.71, -74.01)):
+            pl = Place()
+            pl.latitude = lat
+            pl.longitude = lon
+            self.pls.append(pl)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__raw = {}
+        FileStorage._FileStorage__grids = {}
+        FileStorage._FileStorage__lazy = False
+
+    def ids(self, *indices):
+        return [self.pls[i].id for i in indices]
+
+    def test_within(self):
+        self.assertEqual(self.ids(0, 1), models.storage.within(
+            Place, 37.77, -122.42, 50))
+
+    def test_nearest(self):
+        self.assertEqual(self.ids(2, 1), models.storage.nearest(
+            "Place", 34.0, -118.0, 2))
+
+    def test_grid_follows_changes(self):
+        models.storage.within(Place, 0.0, 0.0, 1)
+        self.pls[3].latitude = 37.78
+        self.pls[3].longitude = -122.41
+        models.storage.delete(self.pls[1])
+        pl = Place()
+        pl.latitude = 37.0
+        pl.longitude = -122.0
+        self.assertEqual(self.ids(0, 3) + [pl.id], models.storage.within(
+            Place, 37.77, -122.42, 100))
+
+    def test_unlocated_class(self):
+        with self.assertRaises(ValueError):
+            models.storage.within(City, 0.0, 0.0, 10)
+        with self.assertRaises(ValueError):
+            models.storage.nearest(City, 0.0, 0.0, 1)
+
+    def test_grid_in_lazy_mode(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        self.assertEqual(self.ids(3), models.storage.nearest(
+            Place, 40.0, -74.0, 1))
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+
+
+class TestFileStorage_search(unittest.TestCase):
+    """Unittests for testing the text index of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.pl = Place()
+        self.pl.name = "Loft"
+        self.pl.description = "Sunny loft near the bay"
+        self.rv = Review()
+        self.rv.text = "Great loft, but the street was loud at night"
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__raw = {}
+        FileStorage._FileStorage__text = None
+        FileStorage._FileStorage__lazy = False
+
+    def test_search(self):
+        self.assertEqual(["Place." + self.pl.id, "Review." + self.rv.id],
+                         list(models.storage.search("loft")))
+
+    def test_search_by_class(self):
+        self.assertEqual({"Review." + self.rv.id: self.rv},
+                         models.storage.search("loft", Review))
+        self.assertEqual({"Review." + self.rv.id: self.rv},
+                         models.storage.search("loft", "Review"))
+
+    def test_search_limit(self):
+        self.assertEqual(["Place." + self.pl.id],
+                         list(models.storage.search("loft", limit=1)))
+
+    def test_search_follows_changes(self):
+        models.storage.search("loft")
+        self.pl.description = "Quiet cabin"
+        self.pl.name = "Cabin"
+        models.storage.delete(self.rv)
+        rv = Review()
+        rv.text = "Cozy cabin"
+        self.assertEqual([], list(models.storage.search("loft")))
+        self.assertEqual({"Place." + self.pl.id, "Review." + rv.id},
+                         set(models.storage.search("cabin")))
+
+    def test_search_in_lazy_mode(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        found = models.storage.search("great")
+        self.assertEqual(Review, type(found["Review." + self.rv.id]))
+        self.assertIn("Place." + self.pl.id, FileStorage._FileStorage__raw)
+
+
 if __name__ == "__main__":
     unittest.main()
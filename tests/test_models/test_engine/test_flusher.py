@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/flusher.py.
+
+Unittest classes:
+    TestFlusher
+"""
+import threading
+import unittest
+from models.engine.flusher import Flusher
+
+
+class FakeStorage:
+    """Storage stub counting flushes."""
+
+    def __init__(self):
+        self.flushes = 0
+        self.flushed = threading.Event()
+
+    def flush(self):
+        self.flushes += 1
+        self.flushed.set()
+
+
+class TestFlusher(unittest.TestCase):
+    """Unittests for testing the Flusher thread."""
+
+    def test_flusher_is_daemon(self):
+        self.assertTrue(Flusher(FakeStorage(), 1).daemon)
+
+    def test_no_flush_without_request(self):
+        storage = FakeStorage()
+        flusher = Flusher(storage, 0.01)
+        flusher.start()
+        self.assertFalse(storage.flushed.wait(0.05))
+        flusher.stop()
+        self.assertEqual(0, storage.flushes)
+        self.assertFalse(flusher.is_alive())
+
+    def test_request_flushes(self):
+        storage = FakeStorage()
+        flusher = Flusher(storage, 0.01)
+        flusher.start()
+        flusher.request()
+        self.assertTrue(storage.flushed.wait(1))
+        flusher.stop()
+        self.assertEqual(1, storage.flushes)
+
+    def test_requests_are_coalesced(self):
+        storage = FakeStorage()
+        flusher = Flusher(storage, 60)
+        flusher.start()
+        flusher.request()
+        self.assertTrue(storage.flushed.wait(1))
+        for _ in range(100):
+            flusher.request()
+        flusher.stop()
+        self.assertEqual(1, storage.flushes)
+
+
+if __name__ == "__main__":
+    unittest.main()
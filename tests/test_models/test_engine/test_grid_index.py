@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/grid_index.py.
+
+Unittest classes:
+    TestGridIndex_distance
+    TestGridIndex
+    TestGridIndex_random
+"""
+import random
+import unittest
+from models.engine.grid_index import GridIndex, distance
+
+
+class TestGridIndex_distance(unittest.TestCase):
+    """Unittests for testing the distance function."""
+
+    def test_same_point(self):
+        self.assertEqual(0, distance(37.7, -122.4, 37.7, -122.4))
+
+    def test_one_degree_of_latitude(self):
+        self.assertAlmostEqual(111.195, distance(0, 0, 1, 0), places=3)
+
+    def test_across_antimeridian(self):
+        self.assertAlmostEqual(distance(0, 179.5, 0, 180),
+                               distance(0, 179.5, 0, -179.5) / 2)
+
+
+class TestGridIndex(unittest.TestCase):
+    """Unittests for testing the GridIndex class."""
+
+    def setUp(self):
+        rand = random.Random(1)
+        self.grid = GridIndex(2.0)
+        self.points = {}
+        for i in range(2000):
+            lat, lon = rand.uniform(-90, 90), rand.uniform(-180, 180)
+            if i % 10 == 0:
+                lat = rand.uniform(88, 90)
+            self.points[str(i)] = (lat, lon)
+            self.grid.update(str(i), lat, lon)
+        self.queries = [(rand.uniform(-90, 90), rand.uniform(-180, 180))
+                        for _ in range(8)]
+        self.queries += [(89.9, 0), (-89.9, 0), (0, 179.9), (0, -180)]
+
+    def scan(self, lat, lon):
+        return sorted((distance(lat, lon, *p), id)
+                      for id, p in self.points.items())
+
+    def test_len(self):
+        self.assertEqual(2000, len(self.grid))
+
+    def test_within_matches_scan(self):
+        for lat, lon in self.queries:
+            for km in (10, 500, 3000, 20000):
+                self.assertEqual([r for r in self.scan(lat, lon)
+                                  if r[0] <= km],
+                                 self.grid.within(lat, lon, km))
+
+    def test_nearest_matches_scan(self):
+        for lat, lon in self.queries:
+            for k in (1, 7, 60):
+                self.assertEqual(self.scan(lat, lon)[:k],
+                                 self.grid.nearest(lat, lon, k))
+
+    def test_nearest_more_than_indexed(self):
+        self.assertEqual(2000, len(self.grid.nearest(0, 0, 5000)))
+        self.assertEqual([], self.grid.nearest(0, 0, 0))
+
+    def test_update_moves_id(self):
+        self.grid.update("0", 10.0, 20.0)
+        self.assertEqual("0", self.grid.nearest(10.0, 20.0, 1)[0][1])
+        self.assertEqual(2000, len(self.grid))
+
+    def test_discard(self):
+        self.grid.discard("0")
+        self.grid.discard("0")
+        self.assertEqual(1999, len(self.grid))
+        self.assertNotIn("0", [id for _, id in
+                               self.grid.within(0, 0, 30000)])
+
+    def test_invalid_points_not_indexed(self):
+        for lat, lon in ((None, 0.0), ("1", 0.0), (91.0, 0.0),
+                         (0.0, 181.0), (True, 0.0)):
+            self.grid.update("0", lat, lon)
+            self.assertEqual(1999, len(self.grid))
+
+    def test_size_must_divide_180(self):
+        for size in (7, 0.7, 0, -1, 200):
+            with self.assertRaises(ValueError):
+                GridIndex(size)
+        self.assertEqual(0.1, GridIndex(0.1).size)
+
+
+class TestGridIndex_random(unittest.TestCase):
+    """Unittests comparing GridIndex queries to a scan of random points,
+    many of them on the poles and the antimeridian."""
+
+    def test_matches_scan(self):
+        rand = random.Random(2)
+        for size in (1, 5, 30):
+            for _ in range(15):
+                grid = GridIndex(size)
+                points = {}
+                for i in range(rand.randint(5, 80)):
+                    lat = rand.choice((rand.uniform(-90, 90), 90.0, -90.0,
+                                       rand.uniform(85, 90)))
+                    lon = rand.choice((rand.uniform(-180, 180), 180.0,
+                                       -180.0, rand.uniform(175, 180)))
+                    points[str(i)] = (lat, lon)
+                    grid.update(str(i), lat, lon)
+                lat = rand.choice((rand.uniform(-90, 90), 89.5, -90.0))
+                lon = rand.choice((rand.uniform(-180, 180), 179.9))
+                scan = sorted((distance(lat, lon, *p), id)
+                              for id, p in points.items())
+                for k in (1, 7):
+                    self.assertEqual(scan[:k], grid.nearest(lat, lon, k))
+                for km in (200, 2000):
+                    self.assertEqual([r for r in scan if r[0] <= km],
+                                     grid.within(lat, lon, km))
+
+
+if __name__ == "__main__":
+    unittest.main()
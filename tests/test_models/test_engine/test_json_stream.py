@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/json_stream.py.
+
+Unittest classes:
+    TestJsonStream_iterload
+    TestJsonStream_dump_fragments
+"""
+import json
+import unittest
+from io import StringIO
+from models.engine.json_stream import iterload, dump_fragments
+
+
+class TestJsonStream_iterload(unittest.TestCase):
+    """Unittests for testing the iterload function."""
+
+    objdict = {
+        "Place.1": {"id": "1", "name": '{"Loft": [1, 2]}',
+                    "price_by_night": 123456, "latitude": 7.25,
+                    "amenity_ids": ["a", "b"], "__class__": "Place"},
+        "User.2": {"id": "2", "first_name": "Betty", "__class__": "User"},
+        "State.3": {"id": "3", "__class__": "State"}
+    }
+
+    def test_yields_entries_in_order(self):
+        text = json.dumps(self.objdict)
+        self.assertEqual(list(self.objdict.items()),
+                         list(iterload(StringIO(text))))
+
+    def test_is_lazy(self):
+        entries = iterload(StringIO(json.dumps(self.objdict)))
+        self.assertEqual(("Place.1", self.objdict["Place.1"]), next(entries))
+
+    def test_small_chunks(self):
+        text = json.dumps(self.objdict)
+        for chunk_size in range(1, 10):
+            self.assertEqual(self.objdict,
+                             dict(iterload(StringIO(text), chunk_size)))
+
+    def test_number_across_chunks(self):
+        self.assertEqual([("a", 123456)],
+                         list(iterload(StringIO('{"a": 123456}'), 2)))
+
+    def test_whitespace(self):
+        text = json.dumps(self.objdict, indent=4)
+        self.assertEqual(self.objdict, dict(iterload(StringIO(text), 5)))
+
+    def test_empty_object(self):
+        self.assertEqual([], list(iterload(StringIO(" {\n} "))))
+
+    def test_invalid_documents(self):
+        for text in ("", "[]", '{"a" 1}', '{"a": 1', '{"a": 1 "b": 2}',
+                     "{1: 2}", '{"a": }'):
+            with self.assertRaises(json.JSONDecodeError):
+                list(iterload(StringIO(text), 2))
+
+
+class TestJsonStream_dump_fragments(unittest.TestCase):
+    """Unittests for testing the dump_fragments function."""
+
+    objdict = TestJsonStream_iterload.objdict
+
+    def pairs(self):
+        return ((k, json.dumps(v)) for k, v in self.objdict.items())
+
+    def test_matches_json_dump(self):
+        f = StringIO()
+        dump_fragments(self.pairs(), f)
+        self.assertEqual(json.dumps(self.objdict), f.getvalue())
+
+    def test_empty(self):
+        f = StringIO()
+        dump_fragments(iter(()), f)
+        self.assertEqual("{}", f.getvalue())
+
+    def test_writes_in_chunks(self):
+        writes = []
+
+        class Recorder:
+            def write(self, text):
+                writes.append(text)
+
+        dump_fragments(self.pairs(), Recorder(), chunk_size=1)
+        self.assertEqual(len(self.objdict) + 1, len(writes))
+        self.assertEqual(self.objdict, json.loads("".join(writes)))
+
+    def test_consumes_pairs_lazily(self):
+        written = []
+
+        class Recorder:
+            def write(self, text):
+                written.append(text)
+
+        def pairs():
+            for k, v in self.objdict.items():
+                yield k, json.dumps(v)
+                self.assertNotEqual([], written)
+
+        dump_fragments(pairs(), Recorder(), chunk_size=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
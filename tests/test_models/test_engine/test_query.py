@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/query.py.
+
+Unittest classes:
+    TestQuery
+"""
+import os
+import models
+import unittest
+from models.engine.file_storage import FileStorage
+from models.engine.query import Query
+from models.city import City
+from models.place import Place
+
+
+class TestQuery(unittest.TestCase):
+    """Unittests for testing the Query class over FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.sf = City()
+        self.la = City()
+        self.pls = []
+        for city, price, guests in ((self.sf, 120, 4), (self.sf, 80, 2),
+                                    (self.la, 300, 6), (self.la, 45, 4),
+                                    (self.la, 95, 5)):
+            pl = Place()
+            pl.city_id = city.id
+            pl.price_by_night = price
+            pl.max_guest = guests
+            self.pls.append(pl)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__raw = {}
+        FileStorage._FileStorage__ranges = {}
+        FileStorage._FileStorage__lazy = False
+
+    def pl(self, *indices):
+        return [self.pls[i] for i in indices]
+
+    def test_query_type(self):
+        self.assertEqual(Query, type(models.storage.query(Place)))
+        self.assertEqual(Place, models.storage.query("Place").cls)
+
+    def test_no_conditions(self):
+        self.assertEqual(self.pls, models.storage.query(Place).all())
+        self.assertIn("scan: class index (5 objects)",
+                      models.storage.query(Place).explain())
+
+    def test_where_equality(self):
+        q = models.storage.query(Place).where(max_guest=4)
+        self.assertEqual(self.pl(0, 3), q.order_by("-price_by_night").all())
+
+    def test_where_operators(self):
+        q = models.storage.query(Place)
+        self.assertEqual(self.pl(4, 0), q.where(price_by_night__gt=80,
+                                                price_by_night__lt=300,
+                                                max_guest__ne=2).all())
+        q = models.storage.query(Place).where(
+            city_id__in=[self.sf.id], price_by_night__gte=80)
+        self.assertEqual(self.pl(1, 0), q.all())
+
+    def test_where_contains(self):
+        self.pls[2].amenity_ids = ["wifi", "pool"]
+        q = models.storage.query(Place).where(amenity_ids__contains="pool")
+        self.assertEqual(self.pl(2), q.all())
+        self.assertIn("foreign key index: amenity_ids contains 'pool'",
+                      q.explain())
+
+    def test_unknown_operator(self):
+        with self.assertRaises(ValueError):
+            models.storage.query(Place).where(price_by_night__near=5)
+
+    def test_uncomparable_values_do_not_match(self):
+        self.pls[0].price_by_night = "cheap"
+        q = models.storage.query(Place).where(price_by_night__lte=100)
+        self.assertEqual(self.pl(3, 1, 4), q.all())
+
+    def test_foreign_key_index(self):
+        q = models.storage.query(Place).where(city_id=self.sf.id,
+                                              price_by_night__lte=100)
+        self.assertEqual(self.pl(1), q.all())
+        self.assertIn("foreign key index: city_id == '{}' (2 candidates)"
+                      .format(self.sf.id), q.explain())
+
+    def test_range_index(self):
+        q = models.storage.query(Place).where(price_by_night__lte=100)
+        self.assertEqual(self.pl(3, 1, 4), q.all())
+        self.assertIn("range index: price_by_night <= 100 (3 candidates)",
+                      q.explain())
+
+    def test_smallest_index_is_chosen(self):
+        q = models.storage.query(Place).where(city_id=self.la.id,
+                                              price_by_night__gte=200)
+        self.assertIn("range index: price_by_night >= 200 (1 candidates)",
+                      q.explain())
+        self.assertEqual(self.pl(2), q.all())
+
+    def test_order_by(self):
+        q = models.storage.query(Place).where(city_id=self.la.id)
+        self.assertEqual(self.pl(2, 4, 3),
+                         q.order_by("-price_by_night").all())
+        q = models.storage.query(Place).order_by("max_guest",
+                                                 "-price_by_night")
+        self.assertEqual(self.pl(1, 0, 3, 4, 2), q.all())
+
+    def test_order_by_uses_range_index(self):
+        q = models.storage.query(Place).order_by("-price_by_night")
+        self.assertIn("order by: -price_by_night (index order)",
+                      q.explain())
+        self.assertEqual(self.pl(2, 0, 4, 1, 3), q.all())
+
+    def test_order_by_keeps_values_not_indexed(self):
+        self.pls[1].price_by_night = None
+        q = models.storage.query(Place).order_by("price_by_night")
+        self.assertNotIn("index order", q.explain())
+        self.assertEqual(self.pl(3, 4, 0, 2, 1), q.all())
+        q = models.storage.query(Place).order_by("-price_by_night")
+        self.assertEqual(self.pl(2, 0, 4, 3, 1), q.all())
+
+    def test_order_by_missing_and_mixed_values(self):
+        self.pls[0].rank = "b"
+        self.pls[2].rank = 3
+        self.pls[3].rank = None
+        self.pls[4].rank = "a"
+        q = models.storage.query(Place).order_by("rank")
+        self.assertEqual(self.pl(2, 4, 0, 1, 3), q.all())
+        q = models.storage.query(Place).order_by("-rank")
+        self.assertEqual(self.pl(0, 4, 2, 1, 3), q.all())
+
+    def test_limit_and_offset(self):
+        q = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual(self.pl(1, 4), q.offset(1).limit(2).all())
+        self.assertIn("offset: 1\n  limit: 2", q.explain())
+
+    def test_first_and_count(self):
+        q = models.storage.query(Place).where(max_guest__gte=5)
+        self.assertEqual(2, q.count())
+        self.assertEqual(self.pls[4], q.first())
+        self.assertIsNone(q.where(max_guest=1).first())
+
+    def test_index_follows_changes(self):
+        q = models.storage.query(Place).where(city_id=self.sf.id)
+        self.assertEqual(2, q.count())
+        self.pls[2].city_id = self.sf.id
+        models.storage.delete(self.pls[0])
+        self.assertEqual(self.pl(1, 2), q.all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/sorted_index.py.
+
+Unittest classes:
+    TestSortedIndex
+"""
+import unittest
+from models.engine.sorted_index import SortedIndex
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Unittests for testing the SortedIndex class."""
+
+    def setUp(self):
+        self.index = SortedIndex()
+        for id, value in (("c", 120), ("a", 80), ("d", 80), ("b", 300),
+                          ("e", 45.5)):
+            self.index.update(id, value)
+
+    def test_len(self):
+        self.assertEqual(5, len(self.index))
+
+    def test_ids_sorted_by_value_then_id(self):
+        self.assertEqual(["e", "a", "d", "c", "b"], self.index.ids())
+
+    def test_range_is_inclusive(self):
+        self.assertEqual(["a", "d", "c"], self.index.ids(80, 120))
+
+    def test_open_ranges(self):
+        self.assertEqual(["c", "b"], self.index.ids(low=100))
+        self.assertEqual(["e", "a", "d"], self.index.ids(high=100))
+
+    def test_empty_range(self):
+        self.assertEqual([], self.index.ids(200, 250))
+
+    def test_top_n(self):
+        self.assertEqual(["b", "c"], self.index.ids(reverse=True, limit=2))
+        self.assertEqual(["e", "a"], self.index.ids(limit=2))
+        self.assertEqual(["d", "a"], self.index.ids(high=100, reverse=True,
+                                                    limit=2))
+
+    def test_update_moves_id(self):
+        self.index.update("b", 10)
+        self.assertEqual(["b", "e", "a", "d", "c"], self.index.ids())
+        self.assertEqual(5, len(self.index))
+
+    def test_discard(self):
+        self.index.discard("a")
+        self.index.discard("a")
+        self.assertEqual(["e", "d", "c", "b"], self.index.ids())
+
+    def test_non_numeric_values_not_indexed(self):
+        for value in ("100", None, True, float("nan")):
+            self.index.update("c", value)
+            self.assertNotIn("c", self.index.ids())
+        self.index.update("c", 1)
+        self.assertEqual("c", self.index.ids()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
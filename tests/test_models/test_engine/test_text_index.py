@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/text_index.py.
+
+Unittest classes:
+    TestTextIndex_tokenize
+    TestTextIndex
+"""
+import unittest
+from models.engine.text_index import TextIndex, tokenize
+
+
+class TestTextIndex_tokenize(unittest.TestCase):
+    """Unittests for testing the tokenize function."""
+
+    def test_words_are_lowercase(self):
+        self.assertEqual(["sunny", "loft", "near", "the", "bay"],
+                         tokenize("Sunny LOFT, near the bay!"))
+
+    def test_unicode_words(self):
+        self.assertEqual(["café", "crème"], tokenize("Café-Crème"))
+
+    def test_no_words(self):
+        self.assertEqual([], tokenize(" ... "))
+
+
+class TestTextIndex(unittest.TestCase):
+    """Unittests for testing the TextIndex class."""
+
+    def setUp(self):
+        self.index = TextIndex()
+        self.index.update("a", ("Loft", "Sunny loft near the bay"))
+        self.index.update("b", ("Cabin", "Quiet cabin in the woods"))
+        self.index.update("c", ("Great loft, great view",))
+
+    def docs(self, query, **kwargs):
+        return [doc for _, doc in self.index.search(query, **kwargs)]
+
+    def test_len(self):
+        self.assertEqual(3, len(self.index))
+
+    def test_search_ranks_by_term_frequency(self):
+        self.assertEqual(["a", "c"], self.docs("loft"))
+
+    def test_search_any_word(self):
+        self.assertEqual({"b", "c"}, set(self.docs("woods view")))
+
+    def test_rare_words_rank_higher(self):
+        self.assertEqual("b", self.docs("the cabin")[0])
+
+    def test_search_no_match(self):
+        self.assertEqual([], self.docs("castle"))
+        self.assertEqual([], TextIndex().search("loft"))
+
+    def test_search_limit(self):
+        self.assertEqual(["a"], self.docs("loft", limit=1))
+
+    def test_search_accept(self):
+        self.assertEqual(["c"], self.docs("loft",
+                                          accept=lambda doc: doc != "a"))
+
+    def test_update_replaces_words(self):
+        self.index.update("a", ("Castle",))
+        self.assertEqual(["c"], self.docs("loft"))
+        self.assertEqual(["a"], self.docs("castle"))
+
+    def test_discard(self):
+        self.index.discard("a")
+        self.index.discard("a")
+        self.assertEqual(2, len(self.index))
+        self.assertEqual(["c"], self.docs("loft"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ Unittest classes:
     TestPlace_instantiation
     TestPlace_save
     TestPlace_to_dict
+    TestPlace_amenities
 """
 import os
 import models
@@ -12,6 +13,7 @@ import unittest
 from datetime import datetime
 from time import sleep
 from models.place import Place
+from models.amenity import Amenity
 
 
 class TestPlace_instantiation(unittest.TestCase):
@@ -94,7 +96,8 @@ class TestPlace_instantiation(unittest.TestCase):
 
     def test_amenity_ids_is_public_class_attribute(self):
         pl = Place()
-        self.assertEqual(list, type(Place.amenity_ids))
+        self.assertEqual(tuple, type(Place.amenity_ids))
+        self.assertEqual(list, type(Place._defaults["amenity_ids"]))
         self.assertIn("amenity_ids", dir(pl))
         self.assertNotIn("amenity_ids", pl.__dict__)
 
@@ -245,5 +248,59 @@ class TestPlace_to_dict(unittest.TestCase):
             pl.to_dict(None)
 
 
+class TestPlace_amenities(unittest.TestCase):
+    """Unittests for testing the amenities of the Place class."""
+
+    def setUp(self):
+        self.pl = Place()
+        self.wifi = Amenity()
+        self.pool = Amenity()
+
+    def tearDown(self):
+        for obj in (self.pl, self.wifi, self.pool):
+            models.storage.delete(obj)
+
+    def test_add_amenity(self):
+        self.pl.add_amenity(self.wifi)
+        self.pl.add_amenity(self.wifi)
+        self.assertEqual([self.wifi.id], self.pl.amenity_ids)
+        self.assertEqual((), Place.amenity_ids)
+
+    def test_default_cannot_be_changed_in_place(self):
+        with self.assertRaises(AttributeError):
+            self.pl.amenity_ids.append(self.wifi.id)
+        self.assertEqual((), Place().amenity_ids)
+
+    def test_remove_amenity(self):
+        self.pl.add_amenity(self.wifi)
+        self.pl.add_amenity(self.pool)
+        self.pl.remove_amenity(self.wifi)
+        self.pl.remove_amenity(self.wifi)
+        self.assertEqual([self.pool.id], self.pl.amenity_ids)
+
+    def test_places_with_amenity(self):
+        other = Place()
+        self.addCleanup(models.storage.delete, other)
+        self.pl.add_amenity(self.wifi)
+        self.assertEqual({"Place." + self.pl.id: self.pl},
+                         models.storage.children(self.wifi, Place))
+
+    def test_places_with_all_amenities(self):
+        other = Place()
+        self.addCleanup(models.storage.delete, other)
+        self.pl.add_amenity(self.wifi)
+        self.pl.add_amenity(self.pool)
+        other.add_amenity(self.wifi)
+        self.assertEqual([self.pl], list(models.storage.children_of_all(
+            [self.wifi, self.pool], Place).values()))
+        self.assertEqual(2, len(models.storage.children_of_all(
+            [self.wifi], Place)))
+
+    def test_removed_amenity_unindexed(self):
+        self.pl.add_amenity(self.wifi)
+        self.pl.remove_amenity(self.wifi)
+        self.assertEqual({}, models.storage.children(self.wifi, Place))
+
+
 if __name__ == "__main__":
     unittest.main()